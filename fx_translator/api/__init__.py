@@ -6,9 +6,13 @@ from fx_translator.api.base import get_http_session, HTTP
 from fx_translator.api.huridocs import (
     huridocs_analyze_pdf,
     huridocs_analyze_pdf_smart,
+    huridocs_analyze_pdf_stream,
     huridocs_visualize_pdf,
 )
-from fx_translator.api.lmstudio import lmstudio_translate_simple
+from fx_translator.api.lmstudio import (
+    lmstudio_translate_batch,
+    lmstudio_translate_simple,
+)
 
 __all__ = [
     # Base
@@ -17,7 +21,9 @@ __all__ = [
     # HURIDOCS
     "huridocs_analyze_pdf",
     "huridocs_analyze_pdf_smart",
+    "huridocs_analyze_pdf_stream",
     "huridocs_visualize_pdf",
     # LM Studio
     "lmstudio_translate_simple",
+    "lmstudio_translate_batch",
 ]
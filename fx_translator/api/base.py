@@ -5,23 +5,38 @@
 """
 
 from __future__ import annotations
+
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from fx_translator.core.config import MAX_RETRIES, BACKOFF_FACTOR, TIMEOUT
+from fx_translator.core.config import (
+    MAX_RETRIES,
+    BACKOFF_FACTOR,
+    TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+)
 
 
 def get_http_session(
     total: int = MAX_RETRIES,
     backoff: float = BACKOFF_FACTOR,
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
 ) -> requests.Session:
     """
     Создаёт HTTP сессию с настроенной retry логикой.
 
+    Соединения переиспользуются (keep-alive): запросы к HURIDOCS и
+    LM Studio не открывают TCP-соединение заново, в том числе из
+    нескольких потоков перевода одновременно.
+
     Args:
         total: Максимальное количество повторных попыток
         backoff: Коэффициент экспоненциальной задержки между попытками
+        pool_connections: Число хостов, для которых хранится пул соединений
+        pool_maxsize: Максимум соединений в пуле одного хоста
 
     Returns:
         Настроенная requests.Session с retry адаптером
@@ -37,7 +52,11 @@ def get_http_session(
         raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
 
     s = requests.Session()
     s.mount("http://", adapter)
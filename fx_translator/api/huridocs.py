@@ -8,7 +8,12 @@ from __future__ import annotations
 import os
 import io
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from fx_translator.core.config import (
     DEFAULT_HURIDOCS_BASE,
@@ -17,6 +22,7 @@ from fx_translator.core.config import (
     TIMEOUT,
 )
 from fx_translator.api.base import HTTP
+from fx_translator.utils.json_helpers import json_loads
 from fx_translator.utils.metrics import Timer, log_metric
 
 
@@ -74,7 +80,7 @@ def huridocs_analyze_pdf_smart(
                 continue
 
             resp.raise_for_status()
-            data = resp.json()
+            data = json_loads(resp.content)
 
             # Проверяем формат ответа
             if isinstance(data, dict) and "segments" in data:
@@ -136,7 +142,7 @@ def huridocs_analyze_pdf(
     log_metric("huridocs_analyze", None, "POST", dur, None, len(data), url)
 
     resp.raise_for_status()
-    data_json = resp.json()
+    data_json = json_loads(resp.content)
 
     # Проверяем формат ответа
     if isinstance(data_json, dict) and "segments" in data_json:
@@ -148,6 +154,85 @@ def huridocs_analyze_pdf(
     raise ValueError("HURIDOCS response missing 'segments' key")
 
 
+def huridocs_analyze_pdf_stream(
+    pdf_path: str,
+    base_url: str = DEFAULT_HURIDOCS_BASE,
+    analyze_path: str = HURIDOCS_ANALYZE_PATH,
+    timeout: int = TIMEOUT,
+    fast: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Анализирует PDF через HURIDOCS API, отдавая сегменты по одному.
+
+    Если установлен ijson, ответ разбирается потоком прямо из сокета:
+    в памяти нет ни всего тела ответа, ни списка из всех сегментов.
+    Без ijson ответ читается целиком, как в huridocs_analyze_pdf.
+
+    Args:
+        pdf_path: Путь к PDF файлу
+        base_url: Базовый URL HURIDOCS API
+        analyze_path: Путь endpoint для анализа
+        timeout: Таймаут запроса в секундах
+
+    Yields:
+        Сегменты в JSON формате
+
+    Raises:
+        requests.HTTPError: При HTTP ошибках
+        ValueError: При неожиданном формате ответа
+    """
+    if ijson is None:
+        yield from huridocs_analyze_pdf(
+            pdf_path, base_url, analyze_path, timeout=timeout, fast=fast
+        )
+        return
+
+    url = (
+        f"{base_url.rstrip('/')}/{analyze_path}"
+        if analyze_path
+        else base_url.rstrip("/")
+    )
+
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+
+    t = Timer()
+    files = {"file": (os.path.basename(pdf_path), io.BytesIO(data), "application/pdf")}
+    form_data = {"fast": "true" if fast else "false"}
+    resp = HTTP.post(url, files=files, data=form_data, timeout=timeout, stream=True)
+    dur = t.ms()
+
+    log_metric("huridocs_analyze", None, "POST", dur, None, len(data), url)
+
+    with resp:
+        resp.raise_for_status()
+
+        # Ответ бывает списком сегментов или объектом с ключом "segments":
+        # смотрим на первый значимый байт, не вычитывая его из потока
+        # auto_close=False: иначе urllib3 закрывает поток на последнем байте,
+        # и BufferedReader падает на чтении EOF (закрывает его with resp)
+        resp.raw.decode_content = True
+        resp.raw.auto_close = False
+        stream = io.BufferedReader(resp.raw)
+        is_object = stream.peek(64).lstrip()[:1] == b"{"
+
+        # Ключ "segments" отслеживаем по событиям парсера: пустой список
+        # сегментов (пустой PDF) допустим, ошибка - только если ключа нет
+        has_segments = False
+
+        def events() -> Iterator[Any]:
+            nonlocal has_segments
+            for prefix, event, value in ijson.parse(stream, use_float=True):
+                if not prefix and event == "map_key" and value == "segments":
+                    has_segments = True
+                yield prefix, event, value
+
+        yield from ijson.items(events(), "segments.item" if is_object else "item")
+
+        if is_object and not has_segments:
+            raise ValueError("HURIDOCS response missing 'segments' key")
+
+
 def huridocs_visualize_pdf(
     pdf_path: str,
     out_pdf_path: str,
@@ -6,7 +6,9 @@
 
 from __future__ import annotations
 import logging
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 
 from fx_translator.core.config import (
     DEFAULT_LMSTUDIO_BASE,
@@ -19,6 +21,72 @@ from fx_translator.core.config import (
 )
 from fx_translator.core.models import Segment
 from fx_translator.api.base import HTTP
+from fx_translator.utils.cache import TranslationStore
+from fx_translator.utils.json_helpers import (
+    json_dumps,
+    json_loads,
+    parse_first_json_like,
+)
+
+# Кэш переводов: колонтитулы, подписи и шаблонный текст повторяются
+# на многих страницах, и каждый повтор стоил отдельного запроса к модели
+_TRANSLATION_CACHE_SIZE = 10000
+_translation_cache: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+
+def _cached_translation(key: Tuple[str, str, str, str]) -> Optional[str]:
+    """Возвращает перевод из кэша (None, если его нет)."""
+    with _translation_cache_lock:
+        translation = _translation_cache.get(key)
+        if translation is not None:
+            _translation_cache.move_to_end(key)
+        return translation
+
+
+def _remember_translation(key: Tuple[str, str, str, str], translation: str) -> None:
+    """Кладёт перевод в кэш, вытесняя самые старые записи."""
+    with _translation_cache_lock:
+        _translation_cache[key] = translation
+        _translation_cache.move_to_end(key)
+        if len(_translation_cache) > _TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+
+def _clean_text_input(t: str) -> str:
+    """Очищает входной текст от лишних символов."""
+    if not t:
+        return t
+
+    t = t.replace("\u00ad", "").replace("\u00a0", " ")
+
+    # Ограничиваем длину
+    return " ".join(t.split())[:2000]
+
+
+def _clean_response(content: str) -> str:
+    """Очищает ответ модели от лишних префиксов."""
+    content = content.strip()
+
+    if content.startswith("**") and content.endswith("**"):
+        lines = content.split("\n")
+        if len(lines) >= 2 and lines[-1].strip() == "**":
+            content = "\n".join(lines[1:-1])
+
+    # Удаляем типичные префиксы
+    for prefix in ["**", "Translation:", "Перевод:", "Result:"]:
+        if content.lower().startswith(prefix.lower()):
+            content = content[len(prefix) :].lstrip()
+            break
+
+    return content.strip()
+
+
+def _is_passthrough(text: str) -> bool:
+    """Маркеры, номера и чистая пунктуация не переводятся."""
+    if len(text) <= 2 and not text.isalnum():
+        return True
+    return all(c in "•·–—-()[]{}.,;:!?\"'" for c in text)
 
 
 def lmstudio_translate_simple(
@@ -36,33 +104,6 @@ def lmstudio_translate_simple(
     Переводит список сегментов через LM Studio API.
     """
 
-    def clean_text_input(t: str) -> str:
-        """Очищает входной текст от лишних символов."""
-        if not t:
-            return t
-
-        t = t.replace("\u00ad", "").replace("\u00a0", " ")
-
-        # Ограничиваем длину
-        return " ".join(t.split())[:2000]
-
-    def clean_response(content: str) -> str:
-        """Очищает ответ модели от лишних префиксов."""
-        content = content.strip()
-
-        if content.startswith("**") and content.endswith("**"):
-            lines = content.split("\n")
-            if len(lines) >= 2 and lines[-1].strip() == "**":
-                content = "\n".join(lines[1:-1])
-
-        # Удаляем типичные префиксы
-        for prefix in ["**", "Translation:", "Перевод:", "Result:"]:
-            if content.lower().startswith(prefix.lower()):
-                content = content[len(prefix) :].lstrip()
-                break
-
-        return content.strip()
-
     url = f"{base_url.rstrip('/')}/{LMSTUDIO_CHAT_PATH}"
 
     headers = {
@@ -79,21 +120,22 @@ def lmstudio_translate_simple(
         return results
 
     for s in segs_nonempty:
-        clean_input = clean_text_input(s.text)
+        clean_input = _clean_text_input(s.text)
 
-        if len(clean_input) <= 2 and not clean_input.isalnum():
+        if _is_passthrough(clean_input):
             results[s.blockid] = clean_input  # Возвращаем как есть
             continue
 
-            # ✅ Пропускаем только пунктуацию
-        if all(c in "•·–—-()[]{}.,;:!?\"'" for c in clean_input):
-            results[s.blockid] = clean_input
-            continue
-
         if not clean_input:
             results[s.blockid] = ""
             continue
 
+        cache_key = (model, src_lang, tgt_lang, clean_input)
+        cached = _cached_translation(cache_key)
+        if cached is not None:
+            results[s.blockid] = cached
+            continue
+
         # Адаптивный max_tokens
         word_count = len(clean_input.split())
         adaptive_max_tokens = max(DEFAULT_MAX_TOKENS, word_count * 4)
@@ -126,10 +168,12 @@ def lmstudio_translate_simple(
         }
 
         try:
-            resp = HTTP.post(url, headers=headers, json=body, timeout=timeout)
+            resp = HTTP.post(
+                url, headers=headers, data=json_dumps(body), timeout=timeout
+            )
             resp.raise_for_status()
 
-            data = resp.json()
+            data = json_loads(resp.content)
             if "choices" not in data or not data["choices"]:
                 logging.warning(
                     f"Страница {pagenumber}, блок {s.blockid}: LM Studio вернул пустой ответ"
@@ -138,13 +182,179 @@ def lmstudio_translate_simple(
                 continue
 
             content = data["choices"][0]["message"].get("content", "")
-            translation = clean_response(content)
+            translation = _clean_response(content)
 
             # Если перевод пустой — используем оригинал
             results[s.blockid] = translation if translation else clean_input
+            if translation:
+                _remember_translation(cache_key, translation)
 
         except Exception as e:
             logging.warning(f"Страница {pagenumber}, блок {s.blockid}: {e}")
             results[s.blockid] = clean_input
 
     return results
+
+
+def lmstudio_translate_batch(
+    texts: List[str],
+    src_lang: str,
+    tgt_lang: str,
+    lms_base: str = DEFAULT_LMSTUDIO_BASE,
+    lms_model: str = LMSTUDIO_MODEL,
+    temperature: float = DEFAULT_TEMPERATURE,
+    timeout: int = DEFAULT_TRANSLATION_TIMEOUT,
+    store: Optional[TranslationStore] = None,
+) -> List[str]:
+    """
+    Переводит список текстов одним запросом к LM Studio.
+
+    Тексты отправляются JSON-массивом, модель отвечает массивом переводов
+    той же длины. Один HTTP-запрос вместо запроса на каждый текст; если
+    ответ не разобрался или длина не совпала, тексты переводятся по одному
+    через lmstudio_translate_simple. Уже переведённые ранее тексты берутся
+    из кэша и в запрос не попадают; если передан store, кэш дополнительно
+    проверяется и пополняется на диске.
+
+    Args:
+        texts: Тексты для перевода
+        src_lang: Исходный язык
+        tgt_lang: Целевой язык
+        lms_base: Base URL LM Studio API
+        lms_model: Название модели
+        temperature: Температура генерации
+        timeout: Таймаут запроса в секундах
+        store: Дисковый кэш переводов (опционально)
+
+    Returns:
+        Переводы в порядке texts (оригинал, если перевод пустой)
+    """
+    if not texts:
+        return []
+
+    clean = [_clean_text_input(t) for t in texts]
+    out: List[Optional[str]] = [
+        _cached_translation((lms_model, src_lang, tgt_lang, c)) for c in clean
+    ]
+
+    # Маркеры и пунктуация возвращаются как есть, без запроса к модели
+    for i, c in enumerate(clean):
+        if _is_passthrough(c):
+            out[i] = c
+
+    # В модель уходят только тексты, которых нет в кэше
+    misses = [i for i, tr in enumerate(out) if tr is None]
+
+    if misses and store is not None:
+        stored = store.get_many(
+            {(lms_model, src_lang, tgt_lang, clean[i]) for i in misses}
+        )
+        for key, tr in stored.items():
+            _remember_translation(key, tr)
+        for i in misses:
+            out[i] = stored.get((lms_model, src_lang, tgt_lang, clean[i]))
+        misses = [i for i in misses if out[i] is None]
+
+    if not misses:
+        return out  # type: ignore[return-value]
+
+    # Повторы одного текста (подписи, номера разделов) уходят в модель один
+    # раз, перевод первого вхождения достаётся остальным
+    first: Dict[str, int] = {}
+    unique = [i for i in misses if first.setdefault(clean[i], i) == i]
+    pending = [clean[i] for i in unique]
+    word_count = sum(len(t.split()) for t in pending)
+
+    body = {
+        "model": lms_model,
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    f"Translate each string of the JSON array from {src_lang} "
+                    f"to {tgt_lang}. Reply with ONLY a JSON array of "
+                    f"{len(pending)} translated strings in the same order. "
+                    f"Do NOT transliterate. Do NOT add explanations."
+                ),
+            },
+            {"role": "user", "content": json_dumps(pending).decode("utf-8")},
+        ],
+        "temperature": temperature,
+        "max_tokens": max(DEFAULT_MAX_TOKENS, word_count * 4),
+    }
+
+    url = f"{lms_base.rstrip('/')}/{LMSTUDIO_CHAT_PATH}"
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {LMSTUDIO_API_KEY}",
+    }
+
+    try:
+        resp = HTTP.post(url, headers=headers, data=json_dumps(body), timeout=timeout)
+        resp.raise_for_status()
+
+        content = json_loads(resp.content)["choices"][0]["message"].get("content", "")
+        translated = parse_first_json_like(content)
+
+        if isinstance(translated, list) and len(translated) == len(pending):
+            fresh = []
+            for i, tr in zip(unique, translated):
+                tr = _clean_response(str(tr))
+                out[i] = tr or clean[i]
+                if tr:
+                    key = (lms_model, src_lang, tgt_lang, clean[i])
+                    _remember_translation(key, tr)
+                    fresh.append((key, tr))
+            if store is not None:
+                store.put_many(fresh)
+            for i in misses:
+                out[i] = out[first[clean[i]]]
+            return out  # type: ignore[return-value]
+
+        logging.warning(
+            f"LM Studio: пакет из {len(pending)} текстов вернул "
+            f"{len(translated) if isinstance(translated, list) else 'не массив'}, "
+            f"перевод по одному"
+        )
+    except Exception as e:
+        logging.warning(
+            f"LM Studio: пакетный перевод не удался ({e}), перевод по одному"
+        )
+
+    segs = [
+        Segment(
+            pagenumber=0,
+            left=0.0,
+            top=0.0,
+            width=0.0,
+            height=0.0,
+            pagewidth=0.0,
+            pageheight=0.0,
+            text=texts[i],
+            type="Text",
+            blockid=i,
+        )
+        for i in unique
+    ]
+    by_id = lmstudio_translate_simple(
+        model=lms_model,
+        pagenumber=0,
+        segments=segs,
+        src_lang=src_lang,
+        tgt_lang=tgt_lang,
+        base_url=lms_base,
+        temperature=temperature,
+        timeout=timeout,
+    )
+
+    for i in misses:
+        out[i] = by_id.get(first[clean[i]]) or clean[i]
+
+    # Успешные переводы lmstudio_translate_simple кладёт в кэш памяти,
+    # неудачные возвращает оригиналом - на диск идут только первые
+    if store is not None:
+        keys = [(lms_model, src_lang, tgt_lang, clean[i]) for i in unique]
+        found = ((key, _cached_translation(key)) for key in keys)
+        store.put_many((key, tr) for key, tr in found if tr is not None)
+
+    return out  # type: ignore[return-value]
@@ -18,6 +18,7 @@ from fx_translator.core.exceptions import (
     PDFProcessingError,
     SegmentProcessingError,
     ExportError,
+    PipelineCancelled,
 )
 
 __all__ = [
@@ -43,4 +44,5 @@ __all__ = [
     "PDFProcessingError",
     "SegmentProcessingError",
     "ExportError",
+    "PipelineCancelled",
 ]
@@ -16,6 +16,10 @@ DEFAULT_HURIDOCS_BASE = os.environ.get("HURIDOCS_BASE", "http://localhost:5060")
 HURIDOCS_ANALYZE_PATH = os.environ.get("HURIDOCS_ANALYZE_PATH", "")
 HURIDOCS_VISUALIZE_PATH = os.environ.get("HURIDOCS_VISUALIZE_PATH", "visualize")
 
+# Сколько страниц одновременно анализируется в транзакционном конвейере
+# (HURIDOCS держит модель в памяти на каждый запрос - не больше 2-4)
+DEFAULT_HURIDOCS_CONCURRENCY = 2
+
 
 # ============================================================================
 # LM Studio Configuration
@@ -35,6 +39,12 @@ MAX_RETRIES = 5
 TIMEOUT = 180
 BACKOFF_FACTOR = 0.8
 
+# Пул keep-alive соединений общей сессии: число хостов и соединений на хост.
+# Соединений на хост должно хватать на все потоки перевода, иначе лишние
+# соединения закрываются после каждого запроса
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 32
+
 
 # ============================================================================
 # Text Processing Configuration
@@ -71,6 +81,24 @@ DEFAULT_TEMPERATURE = 0.2
 DEFAULT_MAX_TOKENS = 2048
 DEFAULT_TRANSLATION_TIMEOUT = 180
 
+# Сколько страниц одновременно переводится через LM Studio
+DEFAULT_LMS_CONCURRENCY = 4
+
+# Предел текста в одном пакетном запросе к LM Studio, символов
+# (~3000 токенов при ~4 символах на токен)
+DEFAULT_LMS_BATCH_CHARS = 12000
+
+
+# ============================================================================
+# Cache Configuration
+# ============================================================================
+
+# Каталог дискового кэша разметки HURIDOCS и переводов
+CACHE_DIR = os.environ.get(
+    "FX_TRANSLATOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "fx_translator"),
+)
+
 
 # ============================================================================
 # Metrics Configuration
@@ -39,3 +39,9 @@ class ExportError(FXTranslatorError):
     """Ошибка при экспорте результатов."""
 
     pass
+
+
+class PipelineCancelled(FXTranslatorError):
+    """Обработка отменена пользователем (cancel_event конвейера)."""
+
+    pass
@@ -5,10 +5,37 @@
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List
 
 
+def _with_slots(*extra: str):
+    """
+    Пересоздаёт dataclass с __slots__ вместо __dict__.
+
+    Аналог dataclass(slots=True), который появился только в Python 3.10.
+    Значения по умолчанию к этому моменту уже перенесены в __init__,
+    поэтому атрибуты класса с теми же именами можно убрать.
+
+    Args:
+        *extra: Имена динамических атрибутов, которые не являются полями
+    """
+
+    def wrap(cls):
+        names = tuple(f.name for f in fields(cls)) + extra
+        ns = dict(cls.__dict__)
+
+        for name in names:
+            ns.pop(name, None)
+        ns.pop("__dict__", None)
+        ns.pop("__weakref__", None)
+        ns["__slots__"] = names
+
+        return type(cls)(cls.__name__, cls.__bases__, ns)
+
+    return wrap
+
+
 @dataclass
 class TextLine:
     """
@@ -53,11 +80,15 @@ class TextBlock:
     confidence: float = 1.0
 
 
+# translated_text выставляется экспортом перевода (PyMuPDF пайплайн)
+@_with_slots("translated_text")
 @dataclass
 class Segment:
     """
     Сегмент текста на странице PDF.
 
+    Сегментов на документ создаются тысячи, поэтому класс без __dict__.
+
     Attributes:
         pagenumber: Номер страницы (1-based)
         left: Левая координата сегмента
@@ -85,11 +116,15 @@ class Segment:
     lineheight: float = 0.0  # pt (PyMuPDF)
 
 
+@_with_slots()
 @dataclass
 class PageBatch:
     """
     Пакет сегментов для одной страницы.
 
+    Как и Segment, без __dict__: страниц в документе сотни, а батчи
+    копируются на каждом проходе refine/deglue/split.
+
     Attributes:
         pagenumber: Номер страницы (1-based)
         segments: Список сегментов на странице
@@ -4,12 +4,7 @@
 
 from __future__ import annotations
 import re
-from typing import Dict, Tuple, List, Optional
-
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
+from typing import List, Optional
 
 from fx_translator.core.models import PageBatch
 from fx_translator.utils.geometry import sort_segments_reading_order
@@ -67,11 +62,23 @@ def _font_size_for_segment(seg) -> int:
 
 def export_docx(
     pages: List[PageBatch],
-    translations: Dict[Tuple[int, str, int], str],
+    translations: List[List[str]],
     out_docx: str,
     title: Optional[str] = None,
 ) -> None:
-    """Экспортирует страницы с переводами в DOCX."""
+    """
+    Экспортирует страницы с переводами в DOCX.
+
+    translations - список по страницам: translations[i][blockid - 1] -
+    перевод сегмента страницы pages[i].
+    """
+    # python-docx (~60 мс импорта) нужен только на выпуске DOCX, а не при
+    # старте GUI или импорте конвейера
+    from docx import Document
+    from docx.shared import Pt, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.ns import qn
+
     doc = Document()
 
     doc.styles["Normal"].font.name = "Times New Roman"
@@ -83,8 +90,9 @@ def export_docx(
         p.style = doc.styles["Title"]
         p.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-    for page_batch in pages:
+    for page_idx, page_batch in enumerate(pages):
         side = getattr(page_batch, "logical_side", "")
+        page_tr = translations[page_idx]
         side_suffix = f"[{side}]" if side in ("L", "R") else ""
 
         h = doc.add_paragraph(f"Страница {page_batch.pagenumber}{side_suffix}")
@@ -113,7 +121,8 @@ def export_docx(
             orig_text_wrapped = _soft_wrap_tokens(orig_text)
             row[2].paragraphs[0].add_run(orig_text_wrapped)
 
-            tr_text = translations.get((page_batch.pagenumber, side, s.blockid), "")
+            k = s.blockid - 1
+            tr_text = page_tr[k] if 0 <= k < len(page_tr) else ""
             tr_text_sanitized = _sanitize_for_xml(tr_text)
             tr_text_wrapped = _soft_wrap_tokens(tr_text_sanitized)
             run = row[3].paragraphs[0].add_run(tr_text_wrapped)
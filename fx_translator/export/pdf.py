@@ -5,8 +5,9 @@
 """
 
 from __future__ import annotations
+import inspect
 import math
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 try:
     import pymupdf
@@ -28,9 +29,30 @@ from fx_translator.core.config import (
 )
 from fx_translator.utils.geometry import sort_segments_reading_order
 
+# Толщина рамки лейбла с номером блока
+_LABEL_BORDER = 1.5
+
+# Методы Page для типов подсветки (неизвестный тип - highlight)
+_MARKER_METHODS = {
+    "highlight": "add_highlight_annot",
+    "underline": "add_underline_annot",
+    "squiggly": "add_squiggly_annot",
+    "strikeout": "add_strikeout_annot",
+}
+
+# PyMuPDF >= 1.24.11 принимает рамку FreeText прямо в add_freetext_annot.
+# Тогда set_border и отдельный Annot.update() (перегенерация внешнего вида,
+# в новых версиях ~1.5 мс на аннотацию) не нужны
+try:
+    _FREETEXT_BORDER_ARG = (
+        "border_width" in inspect.signature(pymupdf.Page.add_freetext_annot).parameters
+    )
+except (TypeError, ValueError):
+    _FREETEXT_BORDER_ARG = False
+
 
 def annotate_pdf_with_segments(
-    input_pdf: str,
+    input_pdf: Union[str, pymupdf.Document],
     out_pdf: str,
     pages: List[PageBatch],
     use_comments: bool = True,
@@ -43,11 +65,16 @@ def annotate_pdf_with_segments(
 
     Основная функция для создания аннотированного PDF. Создаёт:
     - FreeText аннотации с номерами блоков (один объект = один комментарий)
-    - Highlight подсветку текста (опционально, если show_highlights=True)
+    - Highlight подсветку текста (опционально, если show_highlights=True):
+      одна аннотация на страницу со всеми блоками, внешний вид строится
+      один раз, а не на каждый блок
     - Всплывающие комментарии с деталями
 
+    Вместо пути можно передать уже открытый Document: аннотации
+    добавляются прямо в него, закрывать его должен вызывающий код.
+
     Args:
-        input_pdf: Путь к входному PDF файлу
+        input_pdf: Путь к входному PDF файлу или открытый pymupdf.Document
         out_pdf: Путь для сохранения аннотированного PDF
         pages: Список батчей страниц с сегментами
         use_comments: Использовать комментарии (deprecated, всегда True)
@@ -55,57 +82,46 @@ def annotate_pdf_with_segments(
         include_translation: Включать перевод в комментарии
         show_highlights: Показывать подсветку текста (по умолчанию True)
     """
-    doc = pymupdf.open(input_pdf)
+    if isinstance(input_pdf, pymupdf.Document):
+        doc, own_doc = input_pdf, False
+    else:
+        doc, own_doc = pymupdf.open(input_pdf), True
 
     try:
         for pb in pages:
             pno = pb.pagenumber - 1
 
-            if pno < 0 or pno >= doc.page_count:
+            # Пустой батч (например, пустая половина разворота) - страницу не грузим
+            if pno < 0 or pno >= doc.page_count or not pb.segments:
                 continue
 
             page = doc[pno]
             side = getattr(pb, "logical_side", "")
 
-            for s in sort_segments_reading_order(pb.segments):
-                rect = pymupdf.Rect(s.left, s.top, s.left + s.width, s.top + s.height)
-
-                # ✅ ОПЦИОНАЛЬНАЯ ПОДСВЕТКА ТЕКСТА
-                if show_highlights and annotation_type != "none":
-                    if annotation_type == "highlight":
-                        annot = page.add_highlight_annot(rect)
-                    elif annotation_type == "underline":
-                        annot = page.add_underline_annot(rect)
-                    elif annotation_type == "squiggly":
-                        annot = page.add_squiggly_annot(rect)
-                    elif annotation_type == "strikeout":
-                        annot = page.add_strikeout_annot(rect)
-                    else:
-                        annot = page.add_highlight_annot(rect)
-
+            segs = sort_segments_reading_order(pb.segments)
+
+            # ✅ ОПЦИОНАЛЬНАЯ ПОДСВЕТКА ТЕКСТА (до лейблов, чтобы не ложилась
+            # поверх них; пустые прямоугольники MuPDF не принимает)
+            if show_highlights and annotation_type != "none":
+                rects = [
+                    r
+                    for r in (
+                        pymupdf.Rect(s.left, s.top, s.left + s.width, s.top + s.height)
+                        for s in segs
+                    )
+                    if not r.is_empty
+                ]
+                if rects:
+                    add_marker = getattr(
+                        page,
+                        _MARKER_METHODS.get(annotation_type, "add_highlight_annot"),
+                    )
+                    annot = add_marker(rects)
                     annot.set_colors(stroke=(0.5, 1, 0.5))  # Приятный зелёный
                     annot.set_opacity(0.35)
-
-                    # Комментарий для подсветки
-                    comment_lines = [
-                        f"Block #{s.blockid}",
-                        f"Type: {s.type or 'text'}",
-                        f"Page: {pb.pagenumber}{side}",
-                    ]
-
-                    if s.text:
-                        comment_lines.append(f"\nOriginal:\n{s.text[:150]}")
-
-                    if hasattr(s, "translated_text") and s.translated_text:
-                        comment_lines.append(
-                            f"\nTranslation:\n{s.translated_text[:150]}"
-                        )
-
-                    annot.info["content"] = "\n".join(comment_lines)
-                    annot.info["title"] = f"Segment {s.blockid}"
-                    annot.info["subject"] = s.type or "Text"
                     annot.update()
 
+            for s in segs:
                 # ✅ ЛЕЙБЛ С НОМЕРОМ БЛОКА (FreeText по центру блока)
 
                 label_size = 24
@@ -122,19 +138,34 @@ def annotate_pdf_with_segments(
                 )
 
                 # ✅ FreeText аннотация (один объект = один комментарий)
-                freetext = page.add_freetext_annot(
-                    rect=label_rect,
-                    text=str(s.blockid),
-                    fontsize=12,
-                    fontname="helv",
-                    text_color=(0, 0.4, 0),  # Тёмно-зелёный текст
-                    fill_color=(0.85, 1, 0.85),  # Светло-зелёный фон
-                    align=1,  # Центрирование
-                )
-
-                # Настройка границы (стандартный цвет)
-                freetext.set_border(width=1.5, dashes=None)
-                freetext.set_opacity(1.0)
+                if _FREETEXT_BORDER_ARG:
+                    # Рамка ложится по центру края, и PyMuPDF расширяет Rect на
+                    # полширины рамки: сужаем заранее, итог совпадает с label_rect
+                    half = _LABEL_BORDER / 2
+                    freetext = page.add_freetext_annot(
+                        rect=label_rect + (half, half, -half, -half),
+                        text=str(s.blockid),
+                        fontsize=12,
+                        fontname="helv",
+                        text_color=(0, 0.4, 0),  # Тёмно-зелёный текст
+                        fill_color=(0.85, 1, 0.85),  # Светло-зелёный фон
+                        align=1,  # Центрирование
+                        border_width=_LABEL_BORDER,
+                    )
+                else:
+                    freetext = page.add_freetext_annot(
+                        rect=label_rect,
+                        text=str(s.blockid),
+                        fontsize=12,
+                        fontname="helv",
+                        text_color=(0, 0.4, 0),
+                        fill_color=(0.85, 1, 0.85),
+                        align=1,
+                    )
+
+                    # Настройка границы (стандартный цвет)
+                    freetext.set_border(width=_LABEL_BORDER, dashes=None)
+                    freetext.set_opacity(1.0)
 
                 # Метаданные
                 freetext.info["title"] = f"Block {s.blockid}"
@@ -158,9 +189,11 @@ def annotate_pdf_with_segments(
                     detail_lines.append(f"\nTranslation:\n{s.translated_text[:200]}")
 
                 freetext.info["content"] = "\n".join(detail_lines)
-                freetext.update()
+                if not _FREETEXT_BORDER_ARG:
+                    freetext.update()
 
         doc.save(out_pdf, garbage=4, deflate=True)
 
     finally:
-        doc.close()
+        if own_doc:
+            doc.close()
@@ -10,7 +10,6 @@ Tkinter GUI application for FX-Translator.
 
 from __future__ import annotations
 import os
-import time
 import logging
 import threading
 import queue
@@ -28,12 +27,13 @@ from fx_translator.core.config import (
     HURIDOCS_ANALYZE_PATH,
     HURIDOCS_VISUALIZE_PATH,
 )
+from fx_translator.core.exceptions import PipelineCancelled
 from fx_translator.orchestration.docker import Orchestrator
 from fx_translator.processing.pipeline import (
     run_pipeline_transactional,
     run_pipeline,
+    run_pipeline_pymupdf,
 )
-from fx_translator.processing.extractors.pymupdf import run_pipeline_pymupdf
 from fx_translator.gui.handlers import LogQueueHandler
 
 
@@ -104,6 +104,7 @@ class AppGUI:
         # Управление паузой
         self.pause_flag = threading.Event()
         self.pause_flag.set()
+        self.cancel_flag = threading.Event()
 
         self.use_pdf_comments = tk.BooleanVar(value=True)
         self.pdf_annotation_type = tk.StringVar(value="none")
@@ -311,6 +312,11 @@ class AppGUI:
         )
         self.btn_resume.pack(side=tk.LEFT, padx=4)
 
+        self.btn_stop = ttk.Button(
+            btns, text="Стоп", command=self.on_stop, state="disabled"
+        )
+        self.btn_stop.pack(side=tk.LEFT, padx=4)
+
         self.btn_huri_start = ttk.Button(
             btns, text="Старт HURIDOCS", command=self.on_huri_start
         )
@@ -421,10 +427,17 @@ class AppGUI:
         self.btn_resume.config(state="disabled")
         self.gui_log("▶️ Продолжено.")
 
+    def on_stop(self):
+        """Отменяет обработку: пауза между запросами прерывается сразу."""
+        self.cancel_flag.set()
+        self.btn_stop.config(state="disabled")
+        self.gui_log("⏹️ Остановка: ждём запросы, уже отправленные в LM Studio.")
+
     def wait_if_paused(self):
-        """Ожидает снятия паузы (для использования в pipeline)."""
-        while not self.pause_flag.is_set():
-            time.sleep(0.2)
+        """Ожидает снятия паузы или отмены (для использования в pipeline)."""
+        while not self.pause_flag.wait(timeout=0.2):
+            if self.cancel_flag.is_set():
+                return
 
     # === ORCHESTRATOR MANAGEMENT ===
 
@@ -548,6 +561,7 @@ class AppGUI:
             end: Конечная страница (None = до конца)
         """
         self._set_buttons_enabled(False)
+        self.cancel_flag.clear()
 
         try:
             mode = self.source_mode.get().strip().lower()
@@ -591,8 +605,10 @@ class AppGUI:
                     force_split_exceptions=self.force_split_excl.get(),
                     use_gpu=self.layoutlmv3_use_gpu.get(),
                     dpi=self.layoutlmv3_dpi.get(),
+                    batch_size=batch_size,
                     pause_ms=0,
                     pause_hook=self.wait_if_paused,
+                    cancel_event=self.cancel_flag,
                 )
 
             elif mode == "pymupdf":
@@ -611,8 +627,10 @@ class AppGUI:
                     split_spreads_enabled=split_spreads_enabled,
                     force_split_spreads=bool(self.force_split.get()),
                     force_split_exceptions=self.force_split_excl.get(),
+                    batch_size=batch_size,
                     pause_ms=0,
                     pause_hook=self.wait_if_paused,
+                    cancel_event=self.cancel_flag,
                 )
 
             else:
@@ -638,6 +656,7 @@ class AppGUI:
                         end_page=end_page,
                         pause_ms=0,
                         pause_hook=self.wait_if_paused,
+                        cancel_event=self.cancel_flag,
                         split_spreads_enabled=split_spreads_enabled,
                     )
                 else:
@@ -662,12 +681,16 @@ class AppGUI:
                         force_split_exceptions=self.force_split_excl.get(),
                         force_split_spreads=bool(self.force_split.get()),
                         pause_hook=self.wait_if_paused,
+                        cancel_event=self.cancel_flag,
                         start_page=start_page,
                         end_page=end_page,
                     )
 
             self.gui_log("✅ Готово!")
 
+        except PipelineCancelled:
+            self.gui_log("⏹️ Обработка остановлена.")
+
         except Exception as e:
             self.gui_log(f"❌ Критическая ошибка: {e}")
             self._safe_show_error("Ошибка", str(e))
@@ -697,3 +720,9 @@ class AppGUI:
                 btn.config(state=state)
             except Exception:
                 pass
+
+        # Стоп доступен только во время обработки
+        try:
+            self.btn_stop.config(state="disabled" if enabled else "normal")
+        except Exception:
+            pass
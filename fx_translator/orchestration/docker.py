@@ -6,6 +6,7 @@ Docker orchestration for HURIDOCS service.
 """
 
 from __future__ import annotations
+import os
 import time
 import logging
 import subprocess
@@ -93,6 +94,10 @@ class Orchestrator:
         use_gpu: bool = True,
         lms_base: str = DEFAULT_LMSTUDIO_BASE,
         LMSTUDIO_MODEL: str = LMSTUDIO_MODEL,
+        restart_policy: str = "unless-stopped",
+        memory_limit: str = "8g",
+        shm_size: str = "2g",
+        cpus: Optional[int] = None,
     ):
         """
         Инициализация orchestrator.
@@ -105,6 +110,10 @@ class Orchestrator:
             use_gpu: Использовать GPU (--gpus all)
             lms_base: Base URL для LM Studio
             LMSTUDIO_MODEL: Модель LM Studio
+            restart_policy: Политика перезапуска dockerd (--restart)
+            memory_limit: Лимит памяти контейнера (--memory)
+            shm_size: Размер /dev/shm (--shm-size)
+            cpus: Лимит CPU (--cpus), None = все ядра хоста
         """
         self.huridocs_image = huridocs_image
         self.huridocs_container = huridocs_container
@@ -113,6 +122,10 @@ class Orchestrator:
         self.use_gpu = use_gpu
         self.lms_base = lms_base
         self.lms_model = LMSTUDIO_MODEL
+        self.restart_policy = restart_policy
+        self.memory_limit = memory_limit
+        self.shm_size = shm_size
+        self.cpus = cpus or os.cpu_count() or 1
 
         self.huridocs_base_url: Optional[str] = None
 
@@ -137,11 +150,11 @@ class Orchestrator:
         # ✅ Удаляем старый контейнер если есть
         run_cmd(["docker", "rm", "-f", self.huridocs_container], timeout=60)
 
-        # ✅ Формируем команду согласно документации
+        # ✅ Формируем команду согласно документации.
+        # --rm несовместим с --restart, удаление выполняет stop_huridocs()
         base_cmd = [
             "docker",
             "run",
-            "--rm",  # ✅ Автоудаление контейнера после остановки
             "-d",  # Detached mode для фонового запуска
             "--name",
             self.huridocs_container,
@@ -149,6 +162,20 @@ class Orchestrator:
             f"{self.huridocs_port}:{self.huridocs_internal_port}",
         ]
 
+        # ✅ dockerd сам перезапускает упавший контейнер, лимиты защищают хост от OOM
+        base_cmd.extend(
+            [
+                "--restart",
+                self.restart_policy,
+                "--shm-size",
+                self.shm_size,
+                "--memory",
+                self.memory_limit,
+                "--cpus",
+                str(self.cpus),
+            ]
+        )
+
         # ✅ Добавляем GPU согласно документации
         if self.use_gpu:
             # Важно: '"device=0"' должно быть одним аргументом
@@ -212,19 +239,23 @@ class Orchestrator:
         status_code: Optional[int] = None,
     ) -> bool:
         """
-        Пытается перезапустить контейнер при определённых ошибках.
+        Пытается восстановить контейнер при определённых ошибках.
 
-        Перезапускает только при:
+        Восстанавливает только при:
         - Timeout или ConnectionError
         - HTTP 5xx ошибках
 
+        Сначала ждёт готовности контейнера, который dockerd перезапускает
+        сам (--restart). Полный цикл stop/rm/run выполняется только если
+        контейнер не запущен или не ответил.
+
         Args:
             log: Функция для логирования
             err: Исключение (если есть)
             status_code: HTTP статус код (если есть)
 
         Returns:
-            True если контейнер успешно перезапущен
+            True если контейнер снова готов к работе
         """
         should_restart = False
 
@@ -241,6 +272,13 @@ class Orchestrator:
         if not should_restart:
             return False
 
+        # Контейнер жив — даём dockerd довести авто-перезапуск до конца
+        base = self.get_base_url()
+        if self.is_running() and wait_http_ready(base, timeout_sec=90):
+            self.huridocs_base_url = base
+            log("✅ HURIDOCS снова отвечает после авто-перезапуска.")
+            return True
+
         log("Пытаемся перезапустить HURIDOCS...")
 
         # Останавливаем с подавлением ошибок
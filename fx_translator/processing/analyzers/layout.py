@@ -6,21 +6,21 @@
 
 from __future__ import annotations
 import logging
-from typing import List
+from typing import List, Union
 
 try:
     import pymupdf
 except ImportError:
     import fitz as pymupdf  # type: ignore
 
-from fx_translator.core.models import PageBatch
-from fx_translator.utils.geometry import sort_segments_reading_order
+from fx_translator.core.models import PageBatch, Segment
+from fx_translator.utils.geometry import segments_bbox, sort_segments_reading_order
 from fx_translator.utils.text import parse_page_set
 
 
 def split_spreads(
     pages: List[PageBatch],
-    pdf_path: str,
+    pdf_path: Union[str, pymupdf.Document],
     ratio_threshold: tuple = (1.25, 1.4),
     center_image_threshold: float = 0.33,
     debug: bool = True,
@@ -31,9 +31,12 @@ def split_spreads(
     Если центральный широкоформатный блок пересекает середину — страницу не делим.
     В остальных случаях — делим ровно пополам.
 
+    Вместо пути можно передать уже открытый Document - тогда PDF
+    не открывается повторно; закрывать его должен вызывающий код.
+
     Args:
         pages: Список батчей страниц
-        pdf_path: Путь к PDF файлу
+        pdf_path: Путь к PDF файлу или открытый pymupdf.Document
         ratio_threshold: Диапазон соотношений ширины/высоты для определения разворота
         center_image_threshold: Порог ширины центрального блока (доля от ширины страницы)
         debug: Включить отладочные сообщения
@@ -42,7 +45,10 @@ def split_spreads(
         Список обработанных PageBatch (развороты разделены на L/R)
     """
     result: List[PageBatch] = []
-    doc = pymupdf.open(pdf_path)
+    if isinstance(pdf_path, pymupdf.Document):
+        doc, own_doc = pdf_path, False
+    else:
+        doc, own_doc = pymupdf.open(pdf_path), True
 
     try:
         for pb in pages:
@@ -105,9 +111,20 @@ def split_spreads(
                 result.append(pb)
                 continue
 
-            # Делим пополам (по центру), даже если мало текстовых сегментов
-            left = [s for s in pb.segments if (s.left + s.width * 0.5) <= mid_x]
-            right = [s for s in pb.segments if (s.left + s.width * 0.5) > mid_x]
+            # Делим пополам (по центру), даже если мало текстовых сегментов.
+            # Если весь текст по одну сторону середины, центры не считаем
+            bbox = segments_bbox(pb.segments)
+            left: List[Segment]
+            right: List[Segment]
+            if bbox is None:
+                left, right = [], []
+            elif bbox[2] <= mid_x:
+                left, right = list(pb.segments), []
+            elif bbox[0] > mid_x:
+                left, right = [], list(pb.segments)
+            else:
+                left = [s for s in pb.segments if (s.left + s.width * 0.5) <= mid_x]
+                right = [s for s in pb.segments if (s.left + s.width * 0.5) > mid_x]
 
             left = sort_segments_reading_order(left)
             for i, s in enumerate(left, 1):
@@ -138,7 +155,8 @@ def split_spreads(
             result.append(pb_right)
 
     finally:
-        doc.close()
+        if own_doc:
+            doc.close()
 
     return result
 
@@ -5,18 +5,35 @@
 """
 
 from __future__ import annotations
+import os
 import re
 import logging
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, List, Optional, Tuple, Union, cast
+
+import numpy as np
 
 try:
     import pymupdf
 except ImportError:
     import fitz as pymupdf  # type: ignore
 
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
 from fx_translator.core.models import PageBatch, Segment
-from fx_translator.utils.geometry import sort_segments_reading_order, x_overlap
-from fx_translator.utils.text import clean_text_inplace
+from fx_translator.utils.geometry import (
+    reading_order_key,
+    sort_segments_reading_order,
+    x_overlap,
+)
+from fx_translator.utils.text import clean_text_inplace, upper_median
 
 
 # ============================================================================
@@ -24,8 +41,64 @@ from fx_translator.utils.text import clean_text_inplace
 # ============================================================================
 
 _BULLET_RE = re.compile(r"^(?:[•·–—\-]\s+|\d+[.)]\\s+)", re.UNICODE)
-_END_PUNCT_RE = re.compile(r"[:!?…]\\s*$", re.UNICODE)
-_DROP_CAP_HEAD_RE = re.compile(r"^[A-ZÀ-ÖØ-Ý]\\b", re.UNICODE)
+
+# ============================================================================
+# Наборы символов (вместо regex в горячих местах)
+# ============================================================================
+
+_SENTENCE_END_CHARS = frozenset(".!?…:;")
+_LIST_BULLET_CHARS = frozenset("•·–—-")
+_ASCII_DIGITS = frozenset("0123456789")
+_DROP_CAP_CHARS = frozenset(
+    [chr(c) for c in range(ord("A"), ord("Z") + 1)]
+    + [chr(c) for c in range(0xC0, 0xD7)]  # À-Ö
+    + [chr(c) for c in range(0xD8, 0xDE)]  # Ø-Ý
+)
+
+# Последний непробельный символ строки, означающий конец фразы / перенос
+_END_PUNCT_CHARS = frozenset(":!?…")
+_HYPHEN_CHARS = frozenset("-–—")
+_END_PUNCT_CODES = np.array(sorted(map(ord, _END_PUNCT_CHARS)))
+_HYPHEN_CODES = np.array(sorted(map(ord, _HYPHEN_CHARS)))
+
+# Пороги выбора стратегии по числу страниц (см. _choose_strategy)
+_INLINE_MAX_PAGES = 10
+_LARGE_DOC_PAGES = 200
+
+# Флаги get_text("dict") без картинок: нужны только текстовые строки
+_TEXT_DICT_FLAGS = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+
+# Сколько страниц держать в кэше строк (см. _cached_page_lines)
+_PAGE_LINES_CACHE_SIZE = 256
+
+
+def _ends_with_sentence_punct(s: str) -> bool:
+    """Проверяет, заканчивается ли строка знаком конца фразы."""
+    return bool(s) and s[-1] in _SENTENCE_END_CHARS
+
+
+def _is_list_marker(s: str) -> bool:
+    """Проверяет, начинается ли строка с маркера списка (•, –, 1., 2) ...)."""
+    if not s:
+        return False
+
+    if s[0] in _LIST_BULLET_CHARS:
+        return True
+
+    i, n = 0, len(s)
+    while i < n and s[i] in _ASCII_DIGITS:
+        i += 1
+
+    return 0 < i < n and s[i] in ".)"
+
+
+def _starts_with_single_capital(s: str) -> bool:
+    """Проверяет, что строка начинается с отдельной заглавной буквы (буквица)."""
+    if not s or s[0] not in _DROP_CAP_CHARS:
+        return False
+
+    # Граница слова после буквы: конец строки или не-словесный символ
+    return len(s) == 1 or not (s[1].isalnum() or s[1] == "_")
 
 
 # ============================================================================
@@ -269,8 +342,6 @@ def _split_by_whitespace_proportional(seg: Segment) -> List[Segment]:
 def _denoise_soft_linebreaks(
     seg: Segment,
     prev_len_thresh: Optional[int] = None,
-    punct_break_re=re.compile(r"[.!?…:;]$"),
-    list_marker_re=re.compile(r"^(?:[•·–—\-]|[0-9]+[.)])"),
 ) -> Segment:
     """
     Удаляет мягкие переносы строк внутри сегмента.
@@ -278,8 +349,6 @@ def _denoise_soft_linebreaks(
     Args:
         seg: Сегмент для обработки
         prev_len_thresh: Пороговая длина строки
-        punct_break_re: Regex для конца предложения
-        list_marker_re: Regex для маркеров списка
 
     Returns:
         Обработанный сегмент
@@ -290,8 +359,8 @@ def _denoise_soft_linebreaks(
     if not lines:
         return seg
 
-    lens = [len(ln.strip()) for ln in lines if ln.strip()]
-    med = sorted(lens)[len(lens) // 2] if lens else 60
+    lens = [n for n in (len(ln.strip()) for ln in lines) if n]
+    med = upper_median(lens) if lens else 60
 
     base = max(30, int(0.9 * med))
     thresh = (
@@ -301,23 +370,28 @@ def _denoise_soft_linebreaks(
     )
 
     out: List[str] = []
+    prev_digit = False
     for i, ln in enumerate(lines):
+        ln_digit = ln.strip().isdigit()
+
         if i > 0 and ln and out and out[-1]:
             prev = out[-1]
             should_merge = (
                 len(prev) < thresh
-                and not punct_break_re.search(prev)
-                and not list_marker_re.match(ln)
-                and not prev.strip().isdigit()
-                and not ln.strip().isdigit()
                 and len(ln) > 3
+                and not prev_digit
+                and not ln_digit
+                and not _ends_with_sentence_punct(prev)
+                and not _is_list_marker(ln)
             )
 
             if should_merge:
                 out[-1] = prev.rstrip() + " " + ln.lstrip()
+                prev_digit = False
                 continue
 
         out.append(ln)
+        prev_digit = ln_digit
 
     seg.text = "\\n".join(out)
     return seg
@@ -360,27 +434,38 @@ def refine_huridocs_segments(
     # 2. Слияние близких сегментов
     merged: List[Segment] = []
     merge_cnt = 0
+    xtol_right = max(8.0, xtol)
 
     for s in cleaned:
-        if merged and _merge_ok(merged[-1], s, page_w, xtol, max(8.0, xtol), gaptol):
+        if merged and _merge_ok(merged[-1], s, page_w, xtol, xtol_right, gaptol):
             merged[-1] = _merge_segments(merged[-1], s)
             merge_cnt += 1
         else:
             merged.append(s)
 
-    # 3. Разделение по whitespace
+    # 3. Разделение по whitespace и фильтрация пустых
     refined: List[Segment] = []
     split_cnt = 0
+    last_key: Optional[Tuple[float, float]] = None
+    in_order = True
 
     for s in merged:
         parts = _split_by_whitespace_proportional(s)
         split_cnt += max(0, len(parts) - 1)
-        refined.extend(parts)
 
-    # 4. Финальная сортировка и фильтрация
-    refined = sort_segments_reading_order(
-        [p for p in refined if (p.text or "").strip()]
-    )
+        for p in parts:
+            if not (p.text or "").strip():
+                continue
+
+            key = (p.top, p.left)
+            if last_key is not None and key < last_key:
+                in_order = False
+            last_key = key
+            refined.append(p)
+
+    # 4. Финальная сортировка (только если порядок нарушен слиянием)
+    if not in_order:
+        refined.sort(key=reading_order_key)
 
     # 5. Перенумерация blockid
     for i, s in enumerate(refined, 1):
@@ -388,7 +473,10 @@ def refine_huridocs_segments(
 
     if merge_cnt > 5 or split_cnt > 5:
         logging.warning(
-            f"[refine] p{page_batch.pagenumber}: merges={merge_cnt}, splits={split_cnt}"
+            "[refine] p%d: merges=%d, splits=%d",
+            page_batch.pagenumber,
+            merge_cnt,
+            split_cnt,
         )
 
     return PageBatch(
@@ -403,18 +491,107 @@ def refine_huridocs_segments(
 # ============================================================================
 
 
-def _line_metrics_from_clip(page, rect: "pymupdf.Rect"):
+@dataclass
+class _LineMetrics:
     """
-    Извлекает метрики строк внутри прямоугольника.
+    Метрики строк в виде параллельных массивов (structure of arrays).
+
+    Attributes:
+        y0, y1, x0, x1: Координаты строк
+        size: Средний размер шрифта строки
+        bold: Признак жирного начертания
+        text: Текст строк
+        last_char: Код последнего непробельного символа строки (0 = пусто)
+        max_height: Наибольшая высота строки (окно поиска по y0)
+    """
+
+    y0: np.ndarray
+    y1: np.ndarray
+    x0: np.ndarray
+    x1: np.ndarray
+    size: np.ndarray
+    bold: np.ndarray
+    text: List[str]
+    last_char: np.ndarray
+    max_height: float = 0.0
+
+    @classmethod
+    def from_tuples(cls, lines: List[tuple]) -> "_LineMetrics":
+        """Строит массивы из кортежей (y0, y1, x0, x1, text, size, bold)."""
+        if not lines:
+            empty = np.empty(0, dtype=np.float64)
+            return cls(
+                empty,
+                empty,
+                empty,
+                empty,
+                empty,
+                np.empty(0, bool),
+                [],
+                np.empty(0, np.int32),
+            )
+
+        y0, y1, x0, x1, text, size, bold = zip(*lines)
+        last_char = np.fromiter(
+            (ord(t.rstrip()[-1:] or "\0") for t in text),
+            dtype=np.int32,
+            count=len(text),
+        )
+        y0_arr = np.array(y0, dtype=np.float64)
+        y1_arr = np.array(y1, dtype=np.float64)
+        return cls(
+            y0=y0_arr,
+            y1=y1_arr,
+            x0=np.array(x0, dtype=np.float64),
+            x1=np.array(x1, dtype=np.float64),
+            size=np.array(size, dtype=np.float64),
+            bold=np.array(bold, dtype=bool),
+            text=list(text),
+            last_char=last_char,
+            max_height=float((y1_arr - y0_arr).max()),
+        )
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def take(self, idx: np.ndarray) -> "_LineMetrics":
+        """Возвращает подмножество строк по массиву индексов."""
+        text = self.text
+        return _LineMetrics(
+            y0=self.y0[idx],
+            y1=self.y1[idx],
+            x0=self.x0[idx],
+            x1=self.x1[idx],
+            size=self.size[idx],
+            bold=self.bold[idx],
+            text=[text[i] for i in idx.tolist()],
+            last_char=self.last_char[idx],
+            max_height=self.max_height,
+        )
+
+    def row(self, i: int) -> tuple:
+        """Возвращает строку i как кортеж (y0, y1, x0, x1, text, size, bold)."""
+        return (
+            float(self.y0[i]),
+            float(self.y1[i]),
+            float(self.x0[i]),
+            float(self.x1[i]),
+            self.text[i],
+            float(self.size[i]),
+            bool(self.bold[i]),
+        )
+
+
+def _extract_line_metrics(data: dict) -> List[tuple]:
+    """
+    Преобразует результат page.get_text("dict") в метрики строк.
 
     Args:
-        page: PyMuPDF страница
-        rect: Прямоугольник для извлечения
+        data: Словарь страницы PyMuPDF
 
     Returns:
         Список кортежей (y0, y1, x0, x1, text, avg_size, is_bold)
     """
-    data = page.get_text("dict", clip=rect)
     lines = []
 
     for blk in data.get("blocks", []):
@@ -425,15 +602,21 @@ def _line_metrics_from_clip(page, rect: "pymupdf.Rect"):
 
             y0, x0, x1 = ln["bbox"][1], ln["bbox"][0], ln["bbox"][2]
             y1 = ln["bbox"][3]
-            txt = "".join(sp.get("text", "") for sp in spans)
-
-            sizes = [
-                float(sp.get("size", 0)) for sp in spans if float(sp.get("size", 0)) > 0
-            ]
-            flags = [int(sp.get("flags", 0)) for sp in spans]
-
-            avg_size = sum(sizes) / len(sizes) if sizes else 0.0
-            is_bold = any((f & (1 << 4)) != 0 for f in flags)
+            txt = "".join([sp.get("text", "") for sp in spans])
+
+            # Один проход по spans: сумма размеров, их число и жирность
+            size_sum = 0.0
+            size_cnt = 0
+            is_bold = False
+            for sp in spans:
+                size = float(sp.get("size", 0))
+                if size > 0:
+                    size_sum += size
+                    size_cnt += 1
+                if int(sp.get("flags", 0)) & (1 << 4):
+                    is_bold = True
+
+            avg_size = size_sum / size_cnt if size_cnt else 0.0
 
             lines.append((y0, y1, x0, x1, txt, avg_size, is_bold))
 
@@ -441,32 +624,149 @@ def _line_metrics_from_clip(page, rect: "pymupdf.Rect"):
     return lines
 
 
-def _looks_like_dropcap(page, seg: Segment) -> bool:
+def _all_page_lines(page) -> _LineMetrics:
+    """
+    Извлекает метрики всех строк страницы одним вызовом get_text.
+
+    Строки отсортированы по (y0, x0), поэтому массив y0 служит индексом
+    для np.searchsorted при выборке строк сегмента.
+
+    Args:
+        page: PyMuPDF страница
+
+    Returns:
+        _LineMetrics всех строк страницы
+    """
+    data = page.get_text("dict", flags=_TEXT_DICT_FLAGS)
+    return _LineMetrics.from_tuples(_extract_line_metrics(data))
+
+
+_page_lines_cache: "OrderedDict[Tuple[tuple, int], _LineMetrics]" = OrderedDict()
+
+
+def _pdf_cache_key(pdf_path: str) -> tuple:
+    """
+    Возвращает ключ, идентифицирующий содержимое PDF файла.
+
+    Args:
+        pdf_path: Путь к PDF файлу
+
+    Returns:
+        Кортеж (абсолютный путь, mtime_ns, размер)
+    """
+    st = os.stat(pdf_path)
+    return (os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+
+
+def _cached_page_lines(page, doc_key: tuple) -> _LineMetrics:
+    """
+    Возвращает строки страницы из кэша процесса или извлекает их.
+
+    Кэш переживает повторные открытия документа: обе половины разворота
+    и повторные проходы deglue используют одно извлечение. При переходе
+    к другому PDF кэш очищается.
+
+    Args:
+        page: PyMuPDF страница
+        doc_key: Ключ документа из _pdf_cache_key
+
+    Returns:
+        _LineMetrics страницы
+    """
+    key = (doc_key, page.number)
+    hit = _page_lines_cache.get(key)
+    if hit is not None:
+        _page_lines_cache.move_to_end(key)
+        return hit
+
+    if _page_lines_cache and next(iter(_page_lines_cache))[0] != doc_key:
+        _page_lines_cache.clear()
+
+    page_lines = _all_page_lines(page)
+    _page_lines_cache[key] = page_lines
+    if len(_page_lines_cache) > _PAGE_LINES_CACHE_SIZE:
+        _page_lines_cache.popitem(last=False)
+
+    return page_lines
+
+
+def _seg_bounds(seg: Segment) -> Tuple[float, float, float, float]:
+    """Возвращает границы сегмента как (x0, y0, x1, y1)."""
+    return (seg.left, seg.top, seg.left + seg.width, seg.top + seg.height)
+
+
+def _line_metrics_from_clip(
+    page,
+    bounds: Tuple[float, float, float, float],
+    page_lines: Optional[_LineMetrics] = None,
+) -> _LineMetrics:
+    """
+    Извлекает метрики строк внутри прямоугольника.
+
+    Если передан page_lines, строки фильтруются по уже извлечённым данным
+    страницы без обращения к MuPDF (и без создания pymupdf.Rect).
+
+    Args:
+        page: PyMuPDF страница
+        bounds: Прямоугольник (x0, y0, x1, y1)
+        page_lines: Предизвлечённые строки страницы (опционально)
+
+    Returns:
+        _LineMetrics строк, отсортированных по (y0, x0)
+    """
+    if page_lines is None:
+        clip = pymupdf.Rect(*bounds)
+        data = page.get_text("dict", clip=clip, flags=_TEXT_DICT_FLAGS)
+        lines = _extract_line_metrics(data)
+        return _LineMetrics.from_tuples(lines)
+
+    x0, y0, x1, y1 = bounds
+
+    # Строка может начинаться выше прямоугольника не более чем на свою высоту
+    lo = int(np.searchsorted(page_lines.y0, y0 - page_lines.max_height, "left"))
+    hi = int(np.searchsorted(page_lines.y0, y1, side="left"))
+
+    # Как и clip в get_text, берём строки, чьи глифы попадают в прямоугольник:
+    # рамки HURIDOCS часто уже bbox строк, поэтому вместо вложенности
+    # достаточно перекрытия на половину высоты строки и по горизонтали
+    ly0, ly1 = page_lines.y0[lo:hi], page_lines.y1[lo:hi]
+    overlap_y = np.minimum(ly1, y1) - np.maximum(ly0, y0)
+    inside = (
+        (overlap_y >= 0.5 * (ly1 - ly0))
+        & (page_lines.x0[lo:hi] < x1)
+        & (page_lines.x1[lo:hi] > x0)
+    )
+    return page_lines.take(np.flatnonzero(inside) + lo)
+
+
+def _looks_like_dropcap(
+    page, seg: Segment, page_lines: Optional[_LineMetrics] = None
+) -> bool:
     """
     Проверяет, является ли сегмент буквицей (drop cap).
 
     Args:
         page: PyMuPDF страница
         seg: Сегмент для проверки
+        page_lines: Предизвлечённые строки страницы (опционально)
 
     Returns:
         True если сегмент похож на буквицу
     """
-    rect = pymupdf.Rect(seg.left, seg.top, seg.left + seg.width, seg.top + seg.height)
-    lines = _line_metrics_from_clip(page, rect)
+    lines = _line_metrics_from_clip(page, _seg_bounds(seg), page_lines)
 
     if len(lines) < 2:
         return False
 
-    (y0a, y1a, x0a, x1a, ta, sa, ba) = lines[0]
-    (y0b, y1b, x0b, x1b, tb, sb, bb) = lines[1]
+    (y0a, y1a, x0a, x1a, ta, sa, ba) = lines.row(0)
+    (y0b, y1b, x0b, x1b, tb, sb, bb) = lines.row(1)
 
     line_h_a = max(1.0, y1a - y0a)
     line_h_b = max(1.0, y1b - y0b)
 
     tall_enough = line_h_a >= line_h_b * 1.5
     big_font = sa > 0 and sb > 0 and sa >= sb * 1.6
-    starts_with_single = bool(_DROP_CAP_HEAD_RE.match((ta or "").strip()))
+    starts_with_single = _starts_with_single_capital((ta or "").strip())
 
     return (tall_enough or big_font) and starts_with_single
 
@@ -495,108 +795,230 @@ def _local_median_gap(gaps: List[float], idx: int, k: int = 5) -> float:
     return s[n // 2] if n % 2 else 0.5 * (s[n // 2 - 1] + s[n // 2])
 
 
-def _should_break_local(
-    prev,
-    curr,
-    gaps,
-    idx,
+def _local_median_gaps(gaps: List[float], k: int = 5) -> List[float]:
+    """
+    Вычисляет локальные медианы зазоров для всех индексов сразу.
+
+    С bottleneck использует скользящую медиану (O(n log k)) по всему массиву,
+    иначе — _local_median_gap для каждого индекса.
+
+    Args:
+        gaps: Список зазоров между строками
+        k: Размер окна (±k элементов)
+
+    Returns:
+        Список медиан, по одной на каждый зазор
+    """
+    if not gaps:
+        return []
+
+    if bn is None:
+        return [_local_median_gap(gaps, i, k=k) for i in range(len(gaps))]
+
+    # move_median считает по окну [j - 2k, j]; NaN-поля по k с каждой стороны
+    # дают центрированное окно [i - k, i + k], обрезанное по краям
+    pad = np.full(k, np.nan)
+    padded = np.concatenate((pad, np.asarray(gaps, dtype=np.float64), pad))
+    med = bn.move_median(padded, window=2 * k + 1, min_count=1)
+    return cast(List[float], med[2 * k :].tolist())
+
+
+def _text_break_masks(lm: _LineMetrics) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисляет текстовые признаки разрыва для всех строк, кроме последней.
+
+    Args:
+        lm: Метрики строк
+
+    Returns:
+        Кортеж (заканчивается пунктуацией, заканчивается переносом)
+    """
+    last = lm.last_char[:-1]
+    return np.isin(last, _END_PUNCT_CODES), np.isin(last, _HYPHEN_CODES)
+
+
+def _split_points_kernel(
+    y0,
+    y1,
+    x0,
+    sz,
+    bold,
+    ends_punct,
+    ends_hyphen,
+    gap_factor=1.8,
+    size_drop=0.12,
+    indent_tol=10.0,
+    k=5,
+):
+    """
+    Скалярное ядро _break_mask для компиляции Numba.
+
+    Сам считает локальные медианы зазоров (окно ±k, сортировка вставками
+    в буфере фиксированного размера) и возвращает индексы строк, с которых
+    начинаются новые части (без нулевого).
+    """
+    n = y0.shape[0]
+    m = n - 1
+    gaps = np.empty(m, dtype=np.float64)
+    for i in range(m):
+        gaps[i] = max(0.0, y0[i + 1] - y1[i])
+
+    out = np.empty(m, dtype=np.int32)
+    cnt = 0
+    buf = np.empty(2 * k + 1, dtype=np.float64)
+
+    for i in range(m):
+        if ends_hyphen[i]:
+            continue
+
+        # Локальная медиана в окне [i - k, i + k]
+        lo = max(0, i - k)
+        hi = min(m - 1, i + k)
+        w = 0
+        for j in range(lo, hi + 1):
+            v = gaps[j]
+            p = w
+            while p > 0 and buf[p - 1] > v:
+                buf[p] = buf[p - 1]
+                p -= 1
+            buf[p] = v
+            w += 1
+        if w % 2:
+            med = buf[w // 2]
+        else:
+            med = 0.5 * (buf[w // 2 - 1] + buf[w // 2])
+
+        g = gaps[i]
+        if not (med > 0 and g > max(med * gap_factor, 2.5)):
+            continue
+
+        ps = sz[i]
+        cs = sz[i + 1]
+        if (
+            (ends_punct[i] and g >= max(med * 1.2, 2.0))
+            or (ps > 0 and cs > 0 and abs(cs - ps) / max(ps, cs) > size_drop)
+            or bold[i] != bold[i + 1]
+            or abs(x0[i + 1] - x0[i]) > indent_tol
+        ):
+            out[cnt] = i + 1
+            cnt += 1
+
+    return out[:cnt]
+
+
+@lru_cache(maxsize=None)
+def _split_points_jit() -> Optional[Callable[..., np.ndarray]]:
+    """
+    Компилирует _split_points_kernel через numba при первом вызове.
+
+    Импорт numba (~0,1-0,2 с) откладывается до первого разрезания сегмента,
+    а не платится при импорте модуля. Без numba возвращает None: тогда ядро
+    не используется, векторный _break_mask быстрее интерпретатора.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    return njit(cache=True, boundscheck=False)(_split_points_kernel)
+
+
+def _break_mask(
+    lm: _LineMetrics,
+    gaps: np.ndarray,
+    local_medians: np.ndarray,
     indent_tol: float = 10.0,
     size_drop: float = 0.12,
     gap_factor: float = 1.8,
-):
+) -> np.ndarray:
     """
-    Проверяет, нужен ли разрыв между строками на основе локальных метрик.
+    Определяет разрывы между всеми соседними строками сразу.
+
+    Элемент i соответствует зазору между строками i и i + 1.
 
     Args:
-        prev: Предыдущая строка (кортеж метрик)
-        curr: Текущая строка (кортеж метрик)
-        gaps: Список всех зазоров
-        idx: Индекс текущего зазора
+        lm: Метрики строк
+        gaps: Зазоры между соседними строками
+        local_medians: Локальные медианы зазоров
         indent_tol: Допуск для отступа
         size_drop: Допуск для изменения размера шрифта
         gap_factor: Множитель для большого зазора
 
     Returns:
-        True если нужен разрыв
+        Булев массив: True если перед строкой i + 1 нужен разрыв
     """
-    (py0, py1, px0, px1, pt, ps, pb) = prev
-    (cy0, cy1, cx0, cx1, ct, cs, cb) = curr
+    ends_punct, ends_hyphen = _text_break_masks(lm)
 
-    gap = max(0.0, cy0 - py1)
-    loc_med = _local_median_gap(gaps, idx, k=5)
+    ps, cs = lm.size[:-1], lm.size[1:]
 
     # Сильные признаки разрыва
-    big_gap = loc_med > 0 and gap > max(loc_med * gap_factor, 2.5)
-    punct_break = _END_PUNCT_RE.search(pt or "") and gap >= max(loc_med * 1.2, 2.0)
-    size_jump = ps > 0 and cs > 0 and (abs(cs - ps) / max(ps, cs) > size_drop)
-    bold_flip = pb != cb and (pb or cb)
-    indent_jump = abs(cx0 - px0) > indent_tol
-
-    # Если предыдущая строка закончилась переносом - точно НЕ резать
-    if (pt or "").rstrip().endswith(("-", "–", "—")):
-        return False
+    big_gap = (local_medians > 0) & (gaps > np.maximum(local_medians * gap_factor, 2.5))
+    punct_break = ends_punct & (gaps >= np.maximum(local_medians * 1.2, 2.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        size_jump = (
+            (ps > 0) & (cs > 0) & (np.abs(cs - ps) / np.maximum(ps, cs) > size_drop)
+        )
+    bold_flip = lm.bold[:-1] != lm.bold[1:]
+    indent_jump = np.abs(lm.x0[1:] - lm.x0[:-1]) > indent_tol
 
-    # Резать только при большом зазоре И хотя бы одном структурном сигнале
-    return bool(big_gap and (punct_break or size_jump or bold_flip or indent_jump))
+    # Строку, закончившуюся переносом, не режем; в остальных случаях режем
+    # только при большом зазоре И хотя бы одном структурном сигнале
+    structural = punct_break | size_jump | bold_flip | indent_jump
+    return np.asarray(~ends_hyphen & big_gap & structural, dtype=bool)
 
 
-def _deglue_segment_with_pdf(page, seg: Segment) -> List[Segment]:
+def _deglue_segment_with_pdf(
+    page, seg: Segment, page_lines: Optional[_LineMetrics] = None
+) -> List[Segment]:
     """
     Разрезает слипшийся сегмент по реальным строкам PyMuPDF.
 
     Args:
         page: PyMuPDF страница
         seg: Сегмент для разделения
+        page_lines: Предизвлечённые строки страницы (опционально)
 
     Returns:
         Список разделённых сегментов
     """
     try:
-        rect = pymupdf.Rect(
-            seg.left, seg.top, seg.left + seg.width, seg.top + seg.height
-        )
-        lines = _line_metrics_from_clip(page, rect)
+        lm = _line_metrics_from_clip(page, _seg_bounds(seg), page_lines)
     except Exception:
         return [seg]
 
-    if not lines or len(lines) < 2:
+    n = len(lm)
+    if n < 2:
         return [seg]
 
-    # Вычисляем зазоры между строками
-    gaps = []
-    for i in range(1, len(lines)):
-        py0, py1, *_ = lines[i - 1]
-        cy0, cy1, *_ = lines[i]
-        gaps.append(max(0.0, cy0 - py1))
-
-    # Разделяем на части
-    parts: List[List[tuple]] = []
-    cur: List[tuple] = [lines[0]]
-
-    for i in range(1, len(lines)):
-        prev = lines[i - 1]
-        curr = lines[i]
-
-        if _should_break_local(prev, curr, gaps, i - 1):
-            parts.append(cur)
-            cur = [curr]
-        else:
-            cur.append(curr)
+    # Разделяем на части: индексы начала каждой части
+    split_points = _split_points_jit()
+    if split_points is not None:
+        ends_punct, ends_hyphen = _text_break_masks(lm)
+        points = split_points(
+            lm.y0, lm.y1, lm.x0, lm.size, lm.bold, ends_punct, ends_hyphen
+        )
+    else:
+        gaps = np.maximum(0.0, lm.y0[1:] - lm.y1[:-1])
+        local_medians = np.asarray(_local_median_gaps(gaps.tolist(), k=5))
+        points = np.flatnonzero(_break_mask(lm, gaps, local_medians)) + 1
 
-    if cur:
-        parts.append(cur)
+    starts = [0] + points.tolist()
 
-    if len(parts) <= 1:
+    if len(starts) <= 1:
         return [seg]
 
+    # Границы всех частей сразу: один проход reduceat по каждой оси
+    y0s = np.minimum.reduceat(lm.y0, starts).tolist()
+    y1s = np.maximum.reduceat(lm.y1, starts).tolist()
+    x0s = np.minimum.reduceat(lm.x0, starts).tolist()
+    x1s = np.maximum.reduceat(lm.x1, starts).tolist()
+
     # Создаём новые сегменты из частей
     out: List[Segment] = []
-    for block_lines in parts:
-        y0 = min(l[0] for l in block_lines)
-        y1 = max(l[1] for l in block_lines)
-        x0 = min(l[2] for l in block_lines)
-        x1 = max(l[3] for l in block_lines)
-        text = "\\n".join((l[4] or "").rstrip() for l in block_lines).strip()
+    for i, (a, b) in enumerate(zip(starts, starts[1:] + [n])):
+        y0, y1, x0, x1 = y0s[i], y1s[i], x0s[i], x1s[i]
+        pieces = [(t or "").rstrip() for t in lm.text[a:b]]
+        text = "\n".join(pieces).strip()
 
         if not text:
             continue
@@ -604,10 +1026,10 @@ def _deglue_segment_with_pdf(page, seg: Segment) -> List[Segment]:
         out.append(
             Segment(
                 pagenumber=seg.pagenumber,
-                left=float(x0),
-                top=float(y0),
-                width=float(x1 - x0),
-                height=float(y1 - y0),
+                left=x0,
+                top=y0,
+                width=x1 - x0,
+                height=y1 - y0,
                 pagewidth=seg.pagewidth,
                 pageheight=seg.pageheight,
                 text=text,
@@ -625,70 +1047,264 @@ def _deglue_segment_with_pdf(page, seg: Segment) -> List[Segment]:
 # ============================================================================
 
 
-def deglue_pages_pdfaware(pages: List[PageBatch], pdf_path: str) -> List[PageBatch]:
+def _deglue_page(page, pb: PageBatch, doc_key: Optional[tuple] = None) -> PageBatch:
     """
-    Нарезает слипшиеся сегменты на основе реальных строк PyMuPDF.
+    Нарезает слипшиеся сегменты одной страницы.
+
+    Args:
+        page: PyMuPDF страница
+        pb: Батч страницы
+        doc_key: Ключ документа для кэша строк (None = без кэша)
+
+    Returns:
+        Обработанный PageBatch
+    """
+    page_lines = _cached_page_lines(page, doc_key) if doc_key else _all_page_lines(page)
+    new_segs: List[Segment] = []
+
+    # Части deglue строятся из строк, отсортированных по y, поэтому итог
+    # почти всегда уже в порядке чтения: отслеживаем это и пересортируем
+    # только при нарушении
+    last_key: Optional[Tuple[float, float]] = None
+    in_order = True
+
+    for s in sort_segments_reading_order(pb.segments):
+        parts = [s]
+
+        # Пропускаем буквицы
+        try:
+            is_dropcap = _looks_like_dropcap(page, s, page_lines)
+        except Exception:
+            is_dropcap = False
+
+        if not is_dropcap:
+            line_h = s.lineheight or 10.0
+            text_len = len((s.text or ""))
+            many_chars = text_len > 120
+            tall = s.height > max(24.0, 2.2 * line_h)
+            very_wide = (s.width > (0.8 * s.pagewidth)) and (text_len > 80)
+
+            # По высоте блок однострочный - резать нечего
+            expected_lines = max(1, int(s.height / max(1.0, line_h)))
+
+            # Deglue только большие/высокие блоки
+            if expected_lines >= 2 and ((many_chars and tall) or very_wide):
+                parts = _deglue_segment_with_pdf(page, s, page_lines)
+
+        for x in parts:
+            if not (x.text or "").strip():
+                continue
+
+            key = (x.top, x.left)
+            if last_key is not None and key < last_key:
+                in_order = False
+            last_key = key
+            new_segs.append(x)
+
+    # Финальная сортировка (только если нужна) и перенумерация
+    if not in_order:
+        new_segs.sort(key=reading_order_key)
+
+    for i, seg in enumerate(new_segs, 1):
+        seg.blockid = i
+
+    return PageBatch(
+        pagenumber=pb.pagenumber,
+        segments=new_segs,
+        logical_side=getattr(pb, "logical_side", ""),
+    )
+
+
+def _page_signature(pb: PageBatch) -> List[Tuple[float, float, float, float, str]]:
+    """Геометрия и текст сегментов страницы - для проверки, изменилась ли она."""
+    return [(s.left, s.top, s.width, s.height, s.text) for s in pb.segments]
+
+
+def _deglue_doc_pages(
+    doc: pymupdf.Document,
+    pages: List[PageBatch],
+    doc_key: Optional[tuple],
+    refine: Optional[Callable[[PageBatch], PageBatch]] = None,
+    skip_unchanged: bool = False,
+) -> List[PageBatch]:
+    """
+    Обрабатывает группу страниц уже открытого документа.
 
     Args:
+        doc: Открытый документ PyMuPDF
         pages: Список батчей страниц
-        pdf_path: Путь к PDF файлу
+        doc_key: Ключ кэша строк (None = без кэша)
+        refine: Рафинировка каждой страницы перед deglue (опционально)
+        skip_unchanged: Не резать страницы, которые не разделены сплитом
+            и не изменены refine (см. deglue_pages_pdfaware)
 
     Returns:
-        Обработанный список батчей
+        Обработанный список батчей в исходном порядке
     """
-    doc = pymupdf.open(pdf_path)
     out: List[PageBatch] = []
 
-    try:
-        for pb in pages:
-            pno = pb.pagenumber - 1
-            if pno < 0 or pno >= doc.page_count:
+    for pb in pages:
+        if skip_unchanged:
+            # Снимок до рафинировки: она правит текст сегментов на месте
+            before = _page_signature(pb)
+            if refine is not None:
+                pb = refine(pb)
+            if not pb.logical_side and _page_signature(pb) == before:
                 out.append(pb)
                 continue
+        elif refine is not None:
+            pb = refine(pb)
 
-            page = doc[pno]
-            new_segs: List[Segment] = []
-
-            for s in sort_segments_reading_order(pb.segments):
-                # Пропускаем буквицы
-                try:
-                    if _looks_like_dropcap(page, s):
-                        new_segs.append(s)
-                        continue
-                except Exception:
-                    pass
-
-                text_len = len((s.text or ""))
-                many_chars = text_len > 120
-                tall = s.height > max(24.0, 2.2 * (s.lineheight or 10.0))
-                very_wide = (s.width > (0.8 * s.pagewidth)) and (text_len > 80)
-
-                # Deglue только большие/высокие блоки
-                if (many_chars and tall) or very_wide:
-                    parts = _deglue_segment_with_pdf(page, s)
-                    new_segs.extend(parts)
-                else:
-                    new_segs.append(s)
-
-            # Финальная сортировка и перенумерация
-            new_segs = sort_segments_reading_order(
-                [x for x in new_segs if (x.text or "").strip()]
-            )
-
-            for i, seg in enumerate(new_segs, 1):
-                seg.blockid = i
+        pno = pb.pagenumber - 1
+        if pno < 0 or pno >= doc.page_count:
+            out.append(pb)
+            continue
 
+        # Страницы без текста (обложки, иллюстрации): резать нечего, а пустые
+        # сегменты _deglue_page всё равно отбросит - страницу PDF не грузим
+        if not any((seg.text or "").strip() for seg in pb.segments):
             out.append(
                 PageBatch(
                     pagenumber=pb.pagenumber,
-                    segments=new_segs,
+                    segments=[],
                     logical_side=getattr(pb, "logical_side", ""),
                 )
             )
+            continue
+
+        out.append(_deglue_page(doc[pno], pb, doc_key))
+
+    return out
+
+
+def _deglue_chunk(
+    pdf_path: str,
+    pages: List[PageBatch],
+    refine: Optional[Callable[[PageBatch], PageBatch]] = None,
+    skip_unchanged: bool = False,
+) -> List[PageBatch]:
+    """
+    Обрабатывает группу страниц с собственным открытием PDF.
+
+    Документ MuPDF нельзя передавать между процессами, поэтому каждый
+    воркер открывает файл сам.
+
+    Args:
+        pdf_path: Путь к PDF файлу
+        pages: Список батчей страниц
+        refine: Рафинировка каждой страницы перед deglue (опционально)
+        skip_unchanged: Пропускать неизменённые страницы (см. выше)
+
+    Returns:
+        Обработанный список батчей в исходном порядке
+    """
+    doc = pymupdf.open(pdf_path, filetype="pdf")
+
+    try:
+        return _deglue_doc_pages(
+            doc, pages, _pdf_cache_key(pdf_path), refine, skip_unchanged
+        )
     finally:
         doc.close()
 
-    return out
+
+def _choose_strategy(n_pages: int, workers: int) -> Tuple[str, int]:
+    """
+    Выбирает способ обработки документа по числу страниц.
+
+    - до _INLINE_MAX_PAGES: в текущем процессе (пул не окупается)
+    - до _LARGE_DOC_PAGES: пул процессов, одна группа страниц на воркер
+    - больше: пул процессов с мелкими группами, чтобы выровнять нагрузку
+      и не держать в памяти огромные результаты одного воркера
+
+    Потоки не используются: PyMuPDF не поддерживает многопоточность
+    (даже с отдельным Document на поток - контекст MuPDF общий) и не
+    отпускает GIL в get_text, так что пул потоков не дал бы параллелизма.
+
+    Args:
+        n_pages: Число страниц
+        workers: Доступное число воркеров
+
+    Returns:
+        Кортеж (стратегия "inline" | "processes", размер группы страниц)
+    """
+    if n_pages <= _INLINE_MAX_PAGES or workers < 2:
+        return "inline", n_pages
+
+    if n_pages <= _LARGE_DOC_PAGES:
+        return "processes", -(-n_pages // workers)
+
+    return "processes", max(1, n_pages // (4 * workers))
+
+
+def deglue_pages_pdfaware(
+    pages: List[PageBatch],
+    pdf_path: Union[str, pymupdf.Document],
+    max_workers: Optional[int] = None,
+    refine: Optional[Callable[[PageBatch], PageBatch]] = None,
+    skip_unchanged: bool = False,
+) -> List[PageBatch]:
+    """
+    Нарезает слипшиеся сегменты на основе реальных строк PyMuPDF.
+
+    Способ обработки (в процессе или пулом процессов) выбирается по числу
+    страниц в _choose_strategy; порядок результата сохраняется.
+
+    refine - рафинировка, которая применяется к каждой странице прямо перед
+    её deglue и в том же воркере (refine_huridocs_segments или partial с
+    допусками). Отдельный пул ради рафинировки не окупается: страница
+    стоит десятки микросекунд, столько же её передача в процесс. Так она
+    идёт параллельно бесплатно - страницы в воркеры передаются всё равно.
+
+    skip_unchanged - для повторной волны после сплита: страницы, которые
+    уже прошли deglue, режутся снова, только если их разделил сплит (есть
+    logical_side) или изменила refine. Повтор на остальных ничего не
+    меняет, а стоит разбора строк PDF.
+
+    Вместо пути можно передать уже открытый Document: тогда повторного
+    открытия (и разбора xref, на больших PDF это секунды) не будет, а
+    страницы обрабатываются в текущем процессе - документ нельзя
+    передать в пул. Закрывать такой документ должен вызывающий код.
+
+    Args:
+        pages: Список батчей страниц
+        pdf_path: Путь к PDF файлу или открытый pymupdf.Document
+        max_workers: Число процессов (None = os.cpu_count())
+        refine: Рафинировка страницы перед deglue (должна сериализоваться pickle)
+        skip_unchanged: Не резать повторно страницы без изменений
+
+    Returns:
+        Обработанный список батчей
+    """
+    if not isinstance(pdf_path, str):
+        doc = pdf_path
+        doc_key = _pdf_cache_key(doc.name) if os.path.isfile(doc.name or "") else None
+        return _deglue_doc_pages(doc, pages, doc_key, refine, skip_unchanged)
+
+    workers = min(max_workers or os.cpu_count() or 1, len(pages))
+    strategy, step = _choose_strategy(len(pages), workers)
+
+    if strategy == "inline":
+        return _deglue_chunk(pdf_path, pages, refine, skip_unchanged)
+
+    chunks = [pages[i : i + step] for i in range(0, len(pages), step)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(
+                ex.map(
+                    _deglue_chunk,
+                    repeat(pdf_path),
+                    chunks,
+                    repeat(refine),
+                    repeat(skip_unchanged),
+                )
+            )
+    except Exception as e:
+        logging.warning(f"[deglue] пул процессов недоступен ({e}), обработка в потоке")
+        return _deglue_chunk(pdf_path, pages, refine, skip_unchanged)
+
+    return [pb for chunk in results for pb in chunk]
 
 
 """
@@ -6,9 +6,15 @@ PyMuPDF-based text extraction with advanced processing.
 """
 
 from __future__ import annotations
+import os
 import re
 import logging
-from typing import List, Dict, Tuple, Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
 
 try:
     import pymupdf
@@ -18,6 +24,69 @@ except ImportError:
 from fx_translator.core.models import TextLine, TextBlock, Segment, PageBatch
 from fx_translator.processing.analyzers.segments import sort_segments_reading_order
 
+# До стольких страниц извлечение идёт в текущем процессе: пул не окупается
+_INLINE_MAX_PAGES = 10
+
+# Флаги get_text("dict") без картинок: блоки изображений всё равно
+# отбрасываются, а MuPDF не тратит время на их сборку
+_TEXT_DICT_FLAGS = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+
+
+# ============================================================================
+# Регулярные выражения (компилируются один раз при импорте модуля)
+# ============================================================================
+
+_WS_RE = re.compile(r"\s+")
+
+# Мягкий перенос удаляется, неразрывный пробел заменяется обычным
+_CLEAN_TABLE = str.maketrans({"\u00ad": None, "\u00a0": " "})
+
+# Маркеры элементов списка: "• ", "1. ", "a) " - одной альтернацией
+_LIST_RE = re.compile(r"^(?:[•·\-*]\s|\d+[.):]?\s|[a-zA-Z][.)]\s)")
+_LIST_BULLET_CHARS = frozenset("•·-*")
+
+# Шумовой текст: номера страниц, римские цифры, одиночные буквы со скобкой.
+# Проверяется через fullmatch, поэтому якоря ^/$ не нужны
+_NOISE_RE = re.compile(r"\d+|[IVXLCDMivxlcdm]+|[a-zA-Z]\)")
+
+
+def _may_start_list_item(text: str) -> bool:
+    """
+    Дешёвый фильтр перед _LIST_RE: False гарантирует, что текст
+    не является элементом списка.
+    """
+    first = text[0]
+    return first in _LIST_BULLET_CHARS or first.isdigit() or text[1:2] in (".", ")")
+
+
+def _line_arrays(lines: List[TextLine]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Раскладывает строки в параллельные массивы (SoA).
+
+    Returns:
+        Кортеж (bbox формы (N, 4), размеры шрифта формы (N,))
+    """
+    bbox = np.array([line.bbox for line in lines], dtype=np.float64).reshape(-1, 4)
+    sizes = np.fromiter(
+        (line.fontsize for line in lines), dtype=np.float64, count=len(lines)
+    )
+    return bbox, sizes
+
+
+def _font_thresholds(body_font_size: float) -> Tuple[float, float, float, float]:
+    """
+    Пороги классификации блоков для страницы.
+
+    Returns:
+        Кортеж (мелкий шрифт, подзаголовок, заголовок, высота подписи)
+    """
+    return (
+        body_font_size * 0.95,
+        body_font_size * 1.3,
+        body_font_size * 1.6,
+        body_font_size * 2.5,
+    )
+
 
 class AdvancedTextProcessor:
     """
@@ -42,12 +111,8 @@ class AdvancedTextProcessor:
             r"(\\w+)—\\s*\\n\\s*(\\w+)",  # длинное тире
         ]
 
-        # Паттерны для удаления шумового текста
-        self.noise_patterns = [
-            r"^\\d+$",  # только номера страниц
-            r"^[IVXLCDMivxlcdm]+$",  # римские цифры
-            r"^[a-zA-Z]\\)$",  # одиночные буквы с скобкой
-        ]
+        # Паттерн для удаления шумового текста (скомпилированный)
+        self.noise_pattern = _NOISE_RE
 
     def extract_advanced_blocks(self, page) -> List[TextBlock]:
         """
@@ -59,166 +124,175 @@ class AdvancedTextProcessor:
         Returns:
             Список TextBlock объектов с метаданными
         """
-        text_dict = page.get_text("dict")
+        text_dict = page.get_text("dict", flags=_TEXT_DICT_FLAGS)
         raw_lines: List[TextLine] = []
 
+        # Локальные ссылки убирают поиск атрибутов в горячем цикле
+        add_line = raw_lines.append
+
         # Извлекаем все строки с метаданными
         for block in text_dict["blocks"]:
-            if "lines" not in block:
+            block_lines = block.get("lines")
+            if not block_lines:
                 continue
 
-            for line in block["lines"]:
-                if not line["spans"]:
+            for line in block_lines:
+                spans = line["spans"]
+                if not spans:
                     continue
 
                 # Собираем данные из всех spans в строке
-                line_text = ""
-                font_sizes = []
-                font_names = []
-                flags_list = []
-
-                for span in line["spans"]:
-                    line_text += span["text"]
-                    font_sizes.append(span["size"])
-                    font_names.append(span["font"])
-                    flags_list.append(span["flags"])
-
+                text_parts: List[str] = []
+                font_sizes: List[float] = []
+                font_names: List[str] = []
+                add_text = text_parts.append
+                add_size = font_sizes.append
+                add_font = font_names.append
+                line_flags = 0
+
+                for span in spans:
+                    add_text(span["text"])
+                    add_size(span["size"])
+                    add_font(span["font"])
+                    line_flags |= span["flags"]
+
+                line_text = "".join(text_parts)
                 if not line_text.strip():
                     continue
 
                 # Вычисляем средние значения
                 avg_font_size = sum(font_sizes) / len(font_sizes)
-                most_common_font = max(set(font_names), key=font_names.count)
-                avg_flags = int(sum(flags_list) / len(flags_list))
+                most_common_font = (
+                    font_names[0]
+                    if len(font_names) == 1
+                    else Counter(font_names).most_common(1)[0][0]
+                )
 
-                raw_lines.append(
+                add_line(
                     TextLine(
                         text=line_text,
                         bbox=tuple(line["bbox"]),
-                        font_size=avg_font_size,
-                        font_name=most_common_font,
-                        flags=avg_flags,
-                        is_bold=bool(avg_flags & 2**4),
-                        is_italic=bool(avg_flags & 2**1),
+                        fontsize=avg_font_size,
+                        fontname=most_common_font,
+                        flags=line_flags,
+                        isbold=bool(line_flags & 2**4),
+                        isitalic=bool(line_flags & 2**1),
                     )
                 )
 
         if not raw_lines:
             return []
 
-        # Сортируем строки по позиции (сверху-вниз, слева-направо)
-        raw_lines.sort(key=lambda l: (l.bbox[1], l.bbox[0]))
+        # Геометрия и размеры шрифта строк - параллельными массивами
+        bbox, sizes = _line_arrays(raw_lines)
+
+        # Сортируем строки по позиции (сверху-вниз, слева-направо).
+        # lexsort устойчив, как и list.sort, и не вызывает Python-ключ
+        # для каждой строки
+        order = np.lexsort((bbox[:, 0], bbox[:, 1]))
+        raw_lines = [raw_lines[i] for i in order.tolist()]
+        bbox = bbox[order]
+        sizes = sizes[order]
 
         # Определяем базовый размер шрифта документа
-        body_font_size = self._get_body_font_size(raw_lines)
+        body_font_size = self._get_body_font_size(sizes)
 
         # Группируем строки в блоки
-        blocks = self._group_lines_into_blocks(raw_lines, body_font_size)
+        blocks = self._group_lines_into_blocks(raw_lines, body_font_size, bbox, sizes)
+
+        # Пороги классификации зависят только от страницы - считаем один раз
+        thresholds = _font_thresholds(body_font_size)
 
         # Объединяем и очищаем текст в блоках
         for block in blocks:
-            block.merged_text = self._merge_and_clean_text(block.lines)
-            block.block_type = self._classify_block_type(block, body_font_size)
+            block.mergedtext = self._merge_and_clean_text(block.lines)
+            block.blocktype = self._classify_block_type(
+                block, body_font_size, thresholds
+            )
 
         # Фильтруем значимые блоки
         return [b for b in blocks if self._is_meaningful_block(b)]
 
-    def _get_body_font_size(self, lines: List[TextLine]) -> float:
+    def _get_body_font_size(self, sizes: np.ndarray) -> float:
         """Определяет медианный размер шрифта основного текста."""
-        font_sizes = [line.font_size for line in lines if line.font_size > 0]
-        if not font_sizes:
+        font_sizes = sizes[sizes > 0]
+        if not font_sizes.size:
             return 12.0
 
-        font_sizes.sort()
-        return font_sizes[len(font_sizes) // 2]
+        # Верхняя медиана через quickselect (O(n)) вместо полной сортировки
+        k = font_sizes.size // 2
+        return float(np.partition(font_sizes, k)[k])
 
     def _group_lines_into_blocks(
-        self, lines: List[TextLine], body_font_size: float
+        self,
+        lines: List[TextLine],
+        body_font_size: float,
+        bbox: Optional[np.ndarray] = None,
+        sizes: Optional[np.ndarray] = None,
     ) -> List[TextBlock]:
         """
         Группирует строки в логические блоки на основе:
         - Вертикальных зазоров
         - Размера шрифта
         - Выравнивания
-        """
-        blocks: List[TextBlock] = []
-        current_block_lines: List[TextLine] = []
-
-        for i, line in enumerate(lines):
-            if not current_block_lines:
-                current_block_lines.append(line)
-                continue
-
-            prev_line = current_block_lines[-1]
-            vertical_gap = line.bbox[1] - prev_line.bbox[3]
-
-            should_merge = self._should_merge_lines(
-                prev_line, line, vertical_gap, body_font_size
-            )
 
-            if should_merge:
-                current_block_lines.append(line)
-            else:
-                if current_block_lines:
-                    blocks.append(self._create_block_from_lines(current_block_lines))
-                current_block_lines = [line]
-
-        # Добавляем последний блок
-        if current_block_lines:
-            blocks.append(self._create_block_from_lines(current_block_lines))
-
-        return blocks
+        bbox и sizes - массивы из _line_arrays(lines); если не переданы,
+        строятся здесь.
+        """
+        if not lines:
+            return []
 
-    def _should_merge_lines(
-        self,
-        prev_line: TextLine,
-        current_line: TextLine,
-        vertical_gap: float,
-        body_font_size: float,
-    ) -> bool:
-        """Определяет, должны ли две строки быть объединены в один блок."""
+        if bbox is None or sizes is None:
+            bbox, sizes = _line_arrays(lines)
 
-        # Большой зазор = новый блок
-        if vertical_gap > self.paragraph_break_threshold:
-            return False
+        breaks = self._line_break_mask(bbox, sizes, body_font_size)
 
-        # Маленький зазор = продолжение блока
-        if vertical_gap <= self.line_merge_threshold:
-            return True
+        # Новый блок начинается после каждого разрыва
+        starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        ends = starts[1:].tolist() + [len(lines)]
 
-        # Средний зазор: смотрим на другие признаки
+        # Общий bbox каждого блока - одним reduceat по каждой оси
+        x0 = np.minimum.reduceat(bbox[:, 0], starts).tolist()
+        y0 = np.minimum.reduceat(bbox[:, 1], starts).tolist()
+        x1 = np.maximum.reduceat(bbox[:, 2], starts).tolist()
+        y1 = np.maximum.reduceat(bbox[:, 3], starts).tolist()
 
-        # Разница в размере шрифта
-        font_size_ratio = (
-            abs(current_line.font_size - prev_line.font_size) / body_font_size
-        )
-        if font_size_ratio > self.font_size_variation_threshold:
-            return False
+        return [
+            TextBlock(
+                lines=lines[a:b],
+                bbox=(x0[i], y0[i], x1[i], y1[i]),
+                blocktype="unknown",
+                mergedtext="",
+            )
+            for i, (a, b) in enumerate(zip(starts.tolist(), ends))
+        ]
 
-        # Разное выравнивание слева
-        left_alignment_diff = abs(current_line.bbox[0] - prev_line.bbox[0])
-        if left_alignment_diff > 12.0:
-            return False
+    def _line_break_mask(
+        self, bbox: np.ndarray, sizes: np.ndarray, body_font_size: float
+    ) -> np.ndarray:
+        """
+        Определяет, где между соседними строками начинается новый блок.
 
-        return True
+        Считается сразу для всех пар строк массивами NumPy.
 
-    def _create_block_from_lines(self, lines: List[TextLine]) -> TextBlock:
-        """Создаёт TextBlock из списка строк."""
-        if not lines:
-            raise ValueError("Cannot create block from empty lines")
-
-        # Вычисляем общий bbox
-        min_x = min(line.bbox[0] for line in lines)
-        min_y = min(line.bbox[1] for line in lines)
-        max_x = max(line.bbox[2] for line in lines)
-        max_y = max(line.bbox[3] for line in lines)
-
-        return TextBlock(
-            lines=lines,
-            bbox=(min_x, min_y, max_x, max_y),
-            block_type="unknown",
-            merged_text="",
+        Returns:
+            Булев массив длины N - 1: True = разрыв перед строкой i + 1
+        """
+        vertical_gap = bbox[1:, 1] - bbox[:-1, 3]
+
+        # Средний зазор: разрыв при разнице в размере шрифта
+        # или при разном выравнивании слева. Порог по шрифту переведён
+        # в пункты один раз на страницу, чтобы не делить каждую разницу
+        font_size_tol = self.font_size_variation_threshold * body_font_size
+        font_size_diff = np.abs(np.diff(sizes))
+        left_alignment_diff = np.abs(np.diff(bbox[:, 0]))
+        style_break = (font_size_diff > font_size_tol) | (left_alignment_diff > 12.0)
+
+        # Большой зазор = новый блок, маленький = продолжение блока
+        breaks = (vertical_gap > self.paragraph_break_threshold) | (
+            (vertical_gap > self.line_merge_threshold) & style_break
         )
+        return np.asarray(breaks, dtype=bool)
 
     def _merge_and_clean_text(self, lines: List[TextLine]) -> str:
         """
@@ -227,84 +301,96 @@ class AdvancedTextProcessor:
         - Мягкие переносы внутри предложений
         - Специальные символы
         """
-        merged_parts: List[str] = []
+        # Строки соединяются пробелом (мягкий перенос внутри предложения
+        # даёт тот же пробел после нормализации), а слово с переносом -
+        # без разделителя. Тире в конце строки - знак препинания, а не
+        # перенос: оно остаётся, и после него ставится пробел
+        pieces: List[str] = []
+        last = len(lines) - 1
 
         for i, line in enumerate(lines):
             text = line.text.strip()
 
-            if i < len(lines) - 1:
-                # Проверяем перенос слова
-                if text.endswith("-") or text.endswith("—"):
-                    merged_parts.append(text[:-1])
-                    continue
-
-                # Проверяем продолжение предложения на следующей строке
-                next_line_text = lines[i + 1].text.strip()
-                if (
-                    text
-                    and next_line_text
-                    and not text.endswith((".", "!", "?", ":", ";", ","))
-                    and next_line_text[0].islower()
-                ):
-                    merged_parts.append(text + " ")
-                    continue
+            if i < last and text.endswith("-"):
+                pieces.append(text[:-1])
+                continue
 
-            merged_parts.append(text)
+            pieces.append(text)
+            if i < last:
+                pieces.append(" ")
 
-        result = " ".join(merged_parts)
+        result = "".join(pieces)
 
-        # Очистка специальных символов
-        result = result.replace("\\u00ad", "")  # мягкий перенос
-        result = result.replace("\\u00a0", " ")  # неразрывный пробел
+        # Очистка специальных символов за один проход
+        result = result.translate(_CLEAN_TABLE)
 
         # Нормализация пробелов
-        result = re.sub(r"\\s+", " ", result).strip()
+        result = _WS_RE.sub(" ", result).strip()
 
         return result
 
-    def _classify_block_type(self, block: TextBlock, body_font_size: float) -> str:
+    def _classify_block_type(
+        self,
+        block: TextBlock,
+        body_font_size: float,
+        thresholds: Optional[Tuple[float, float, float, float]] = None,
+    ) -> str:
         """
         Классифицирует тип блока на основе:
         - Размера шрифта
         - Форматирования (жирный/курсив)
         - Содержимого текста
         - Длины текста
+
+        thresholds - результат _font_thresholds(body_font_size); если не
+        передан, считается здесь.
         """
-        avg_font_size = sum(line.font_size for line in block.lines) / len(block.lines)
-        text = block.merged_text.strip()
+        if thresholds is None:
+            thresholds = _font_thresholds(body_font_size)
+        small_th, header_th, title_th, caption_height = thresholds
+
+        avg_font_size = sum(line.fontsize for line in block.lines) / len(block.lines)
+        # mergedtext уже нормализован _merge_and_clean_text, повторный strip не нужен
+        text = block.mergedtext
+        text_len = len(text)
+
+        # Быстрый путь для обычного абзаца: шрифт основного текста, длинный
+        # текст (не вопрос-подзаголовок и не короткая подпись) и первый
+        # символ, с которого не может начинаться маркер списка
+        if (
+            text_len >= 100
+            and small_th <= avg_font_size <= header_th
+            and not _may_start_list_item(text)
+        ):
+            return self._classify_by_position(block)
 
         # Заголовки и подзаголовки
-        if avg_font_size > body_font_size * 1.3 and len(text) < 150:
+        if avg_font_size > header_th and text_len < 150:
             if text.isupper() or (text[0].isupper() and len(text.split()) <= 8):
-                return (
-                    "title"
-                    if avg_font_size > body_font_size * 1.6
-                    else "section_header"
-                )
+                return "title" if avg_font_size > title_th else "section_header"
 
         # Вопросы как подзаголовки
-        if text.endswith("?") and len(text) < 100 and avg_font_size >= body_font_size:
+        if text.endswith("?") and text_len < 100 and avg_font_size >= body_font_size:
             return "section_header"
 
         # Подписи и сноски (мелкий шрифт)
-        if avg_font_size < body_font_size * 0.95:
-            if (block.bbox[3] - block.bbox[1]) < body_font_size * 2.5:
+        if avg_font_size < small_th:
+            if (block.bbox[3] - block.bbox[1]) < caption_height:
                 return "caption"
             return "footnote"
 
         # Элементы списков
-        if (
-            re.match(r"^[•·\\-*]\\s", text)
-            or re.match(r"^\\d+[.):]?\\s", text)
-            or re.match(r"^[a-zA-Z][.)]\\s", text)
-        ):
+        if _LIST_RE.match(text):
             return "list_item"
 
         # Короткие фрагменты как подписи
-        if len(text) < 30 and len(text.split()) <= 6:
+        if text_len < 30 and len(text.split()) <= 6:
             return "caption"
 
-        # Проверка на колонтитулы по позиции
+        return self._classify_by_position(block)
+
+    def _classify_by_position(self, block: TextBlock) -> str:
+        """Отличает колонтитулы от абзацев по положению блока на странице."""
         pageheight = getattr(block, "pageheight", 800)
         if block.bbox[1] < pageheight * 0.1:  # верхние 10%
             return "page_header"
@@ -315,20 +401,16 @@ class AdvancedTextProcessor:
 
     def _is_meaningful_block(self, block: TextBlock) -> bool:
         """Проверяет, является ли блок значимым (не шум)."""
-        text = block.merged_text.strip()
+        text = block.mergedtext
 
         # Пустой или слишком короткий текст
         if not text or len(text) < 3:
             return False
 
-        # Проверка на шумовые паттерны
-        for pattern in self.noise_patterns:
-            if re.match(pattern, text):
-                return False
+        # Проверка на шумовые паттерны - одна альтернация
+        return self.noise_pattern.fullmatch(text) is None
 
-        return True
-
-    def process_page(self, page) -> List[Dict]:
+    def process_page(self, page) -> List[Segment]:
         """
         Обрабатывает страницу PDF и возвращает список сегментов.
 
@@ -336,244 +418,164 @@ class AdvancedTextProcessor:
             page: PyMuPDF page объект
 
         Returns:
-            Список словарей с данными сегментов
+            Список Segment в порядке блоков
         """
         blocks = self.extract_advanced_blocks(page)
-        result = []
 
+        pagenumber = page.number + 1
+        pagewidth = page.rect.width
+        pageheight = page.rect.height
+
+        segs: List[Segment] = []
         for i, block in enumerate(blocks, 1):
-            bbox = block.bbox
-            result.append(
-                {
-                    "pagenumber": page.number + 1,
-                    "left": bbox[0],
-                    "top": bbox[1],
-                    "width": bbox[2] - bbox[0],
-                    "height": bbox[3] - bbox[1],
-                    "pagewidth": page.rect.width,
-                    "pageheight": page.rect.height,
-                    "text": block.merged_text,
-                    "type": block.block_type,
-                    "blockid": i,
-                    "confidence": block.confidence,
-                }
+            x0, y0, x1, y1 = block.bbox
+            segs.append(
+                Segment(
+                    pagenumber=pagenumber,
+                    left=x0,
+                    top=y0,
+                    width=x1 - x0,
+                    height=y1 - y0,
+                    pagewidth=pagewidth,
+                    pageheight=pageheight,
+                    text=block.mergedtext,
+                    type=block.blocktype,
+                    blockid=i,
+                    lineheight=0.0,
+                )
             )
 
-        return result
+        return segs
 
 
-def extract_pages_pymupdf_advanced(
+def _page_batch_from_page(processor: AdvancedTextProcessor, page) -> PageBatch:
+    """Строит PageBatch одной страницы."""
+    return PageBatch(pagenumber=page.number + 1, segments=processor.process_page(page))
+
+
+def _extract_chunk(pdf_path: str, page_indexes: List[int]) -> List[PageBatch]:
+    """
+    Извлекает группу страниц с собственным открытием PDF.
+
+    Документ MuPDF нельзя передавать между процессами, поэтому каждый
+    воркер открывает файл сам.
+
+    Args:
+        pdf_path: Путь к PDF файлу
+        page_indexes: Индексы страниц (0-based)
+
+    Returns:
+        Список PageBatch в порядке page_indexes
+    """
+    processor = AdvancedTextProcessor()
+    doc = pymupdf.open(pdf_path)
+
+    try:
+        return [_page_batch_from_page(processor, doc[i]) for i in page_indexes]
+    finally:
+        doc.close()
+
+
+def iter_pages_pymupdf_advanced(
     pdf_path: str,
     start_page: Optional[int] = None,
     end_page: Optional[int] = None,
-) -> List[PageBatch]:
+    max_workers: Optional[int] = None,
+) -> Iterator[PageBatch]:
     """
-    Улучшенная версия извлечения страниц с продвинутой обработкой текста.
+    Лениво извлекает страницы по порядку.
+
+    Короткие диапазоны разбираются в текущем процессе по одной странице:
+    словарь get_text каждой страницы освобождается сразу после разбора.
+    Длинные - пулом процессов небольшими непрерывными группами (извлечение
+    упирается в CPU, а PyMuPDF не поддерживает потоки); группа отдаётся,
+    как только готова, не дожидаясь остальных. Потребитель (например,
+    перевод) начинает работу с первых страниц, пока извлекаются следующие.
 
     Args:
         pdf_path: Путь к PDF файлу
         start_page: Начальная страница (1-indexed), None = первая
         end_page: Конечная страница (1-indexed), None = последняя
+        max_workers: Число процессов (None = os.cpu_count())
 
-    Returns:
-        Список PageBatch объектов
+    Yields:
+        PageBatch очередной страницы
     """
-    processor = AdvancedTextProcessor()
     doc = pymupdf.open(pdf_path)
 
     try:
         s = (start_page or 1) - 1
         e = (end_page or doc.page_count) - 1
-        out = []
-
-        for i in range(s, e + 1):
-            page = doc[i]
-            segments_data = processor.process_page(page)
-
-            segs: List[Segment] = []
-            for seg_data in segments_data:
-                segs.append(
-                    Segment(
-                        pagenumber=seg_data["pagenumber"],
-                        left=seg_data["left"],
-                        top=seg_data["top"],
-                        width=seg_data["width"],
-                        height=seg_data["height"],
-                        pagewidth=seg_data["pagewidth"],
-                        pageheight=seg_data["pageheight"],
-                        text=seg_data["text"],
-                        type=seg_data["type"],
-                        blockid=seg_data["blockid"],
-                        lineheight=0.0,
-                    )
-                )
-
-            out.append(PageBatch(pagenumber=i + 1, segments=segs))
-
-        return out
-
+        indexes = list(range(s, e + 1))
+        workers = min(max_workers or os.cpu_count() or 1, len(indexes))
+
+        if len(indexes) <= _INLINE_MAX_PAGES or workers < 2:
+            processor = AdvancedTextProcessor()
+            for i in indexes:
+                yield _page_batch_from_page(processor, doc[i])
+            return
     finally:
         doc.close()
 
+    # Группы не длиннее _INLINE_MAX_PAGES: первые страницы готовы быстро
+    step = min(-(-len(indexes) // workers), _INLINE_MAX_PAGES)
+    chunks = [indexes[i : i + step] for i in range(0, len(indexes), step)]
 
-def extract_pages_pymupdf(
+    done = 0
+    try:
+        ex = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for chunk in ex.map(_extract_chunk, repeat(pdf_path), chunks):
+                for pb in chunk:
+                    done += 1
+                    yield pb
+        finally:
+            # Брошенный генератор (отмена) не ждёт ещё не начатые группы
+            ex.shutdown(cancel_futures=True)
+    except Exception as e:
+        logging.warning(f"[PyMuPDF] пул процессов недоступен ({e}), обработка в потоке")
+        yield from _extract_chunk(pdf_path, indexes[done:])
+
+
+def extract_pages_pymupdf_advanced(
     pdf_path: str,
     start_page: Optional[int] = None,
     end_page: Optional[int] = None,
+    max_workers: Optional[int] = None,
 ) -> List[PageBatch]:
     """
-    Обёртка для обратной совместимости.
+    Улучшенная версия извлечения страниц с продвинутой обработкой текста.
+
+    Собирает в список страницы iter_pages_pymupdf_advanced.
 
     Args:
         pdf_path: Путь к PDF файлу
-        start_page: Начальная страница (1-indexed)
-        end_page: Конечная страница (1-indexed)
+        start_page: Начальная страница (1-indexed), None = первая
+        end_page: Конечная страница (1-indexed), None = последняя
+        max_workers: Число процессов (None = os.cpu_count())
 
     Returns:
         Список PageBatch объектов
     """
-    return extract_pages_pymupdf_advanced(pdf_path, start_page, end_page)
+    return list(
+        iter_pages_pymupdf_advanced(pdf_path, start_page, end_page, max_workers)
+    )
 
 
-def run_pipeline_pymupdf(
-    input_pdf: str,
-    out_pdf_annotated: str,
-    out_docx: str,
-    src_lang: str,
-    tgt_lang: str,
-    lms_base: str,
-    lms_model: str,
+def extract_pages_pymupdf(
+    pdf_path: str,
     start_page: Optional[int] = None,
     end_page: Optional[int] = None,
-    use_llm_grouping: bool = False,
-    split_spreads_enabled: bool = True,
-    force_split_spreads: bool = False,
-    force_split_exceptions: str = "",
-    pause_ms: int = 0,
-    pause_hook: Optional[callable] = None,
-) -> None:
+) -> List[PageBatch]:
     """
-    Полный pipeline обработки PDF с использованием PyMuPDF.
-
-    Выполняет:
-    1. Извлечение текста из PDF с использованием PyMuPDF
-    2. Продвинутую обработку и группировку блоков
-    3. Опциональную LLM-группировку (если use_llm_grouping=True)
-    4. Разделение разворотов (если split_spreads_enabled=True)
-    5. Перевод текста через LM Studio
-    6. Экспорт в аннотированный PDF и DOCX
+    Обёртка для обратной совместимости.
 
     Args:
-        input_pdf: Путь к входному PDF файлу
-        out_pdf_annotated: Путь для сохранения аннотированного PDF
-        out_docx: Путь для сохранения DOCX с переводом
-        src_lang: Исходный язык (например, "en")
-        tgt_lang: Целевой язык (например, "ru")
-        lms_base: Базовый URL LM Studio API
-        lms_model: Имя модели в LM Studio
-        start_page: Начальная страница для обработки
-        end_page: Конечная страница для обработки
-        use_llm_grouping: Использовать LLM для группировки блоков
-        split_spreads_enabled: Автоматически разделять развороты
-        force_split_spreads: Принудительно делить все страницы пополам
-        force_split_exceptions: Строка с номерами страниц-исключений (например, "1,3,5-7")
-        pause_ms: Задержка между страницами в миллисекундах
-        pause_hook: Функция для паузы/возобновления обработки
-    """
-    from fx_translator.processing.analyzers.layout import (
-        split_spreads,
-        split_spreads_force_half,
-    )
-    from fx_translator.api.lmstudio import lmstudio_translate_batch
-    from fx_translator.export.pdf import annotate_pdf_with_segments
-    from fx_translator.export.docx import export_docx
-    from fx_translator.utils.text import parse_page_set
-    import time
-
-    logging.info(f"[PyMuPDF Pipeline] Начало обработки: {input_pdf}")
-    logging.info(f"  Страницы: {start_page or 'начало'}-{end_page or 'конец'}")
-    logging.info(f"  LLM группировка: {use_llm_grouping}")
-    logging.info(f"  Разделение разворотов: {split_spreads_enabled}")
-
-    # 1. Извлечение текста из PDF
-    logging.info("[1/5] Извлечение текста из PDF...")
-    pages = extract_pages_pymupdf_advanced(input_pdf, start_page, end_page)
-    logging.info(f"  Извлечено {len(pages)} страниц")
-
-    # 2. Разделение разворотов (если включено)
-    if split_spreads_enabled:
-        logging.info("[2/5] Разделение разворотов...")
-        pages = split_spreads(pages, input_pdf)
-        logging.info(f"  После разделения: {len(pages)} логических страниц")
-
-    if force_split_spreads:
-        logging.info("[2/5] Принудительное разделение пополам...")
-        exceptions = parse_page_set(force_split_exceptions)
-        pages = split_spreads_force_half(pages, exceptions)
-        logging.info(f"  После принудительного разделения: {len(pages)} страниц")
-
-    # 3. LLM-группировка (если включено)
-    if use_llm_grouping:
-        logging.warning(
-            "[3/5] LLM-группировка пока не реализована для PyMuPDF pipeline"
-        )
-    else:
-        logging.info("[3/5] LLM-группировка отключена")
-
-    # 4. Перевод через LM Studio
-    logging.info(f"[4/5] Перевод текста ({src_lang} → {tgt_lang})...")
-
-    for i, page_batch in enumerate(pages, 1):
-        if pause_hook:
-            pause_hook()
-
-        if pause_ms > 0:
-            time.sleep(pause_ms / 1000.0)
-
-        logging.info(
-            f"  Обработка страницы {page_batch.pagenumber} ({i}/{len(pages)})..."
-        )
-
-        # Переводим сегменты
-        for seg in page_batch.segments:
-            if seg.text and seg.text.strip():
-                try:
-                    translated = lmstudio_translate_batch(
-                        texts=[seg.text],
-                        src_lang=src_lang,
-                        tgt_lang=tgt_lang,
-                        lms_base=lms_base,
-                        lms_model=lms_model,
-                    )
-                    seg.translated_text = translated[0] if translated else seg.text
-                except Exception as e:
-                    logging.error(f"    Ошибка перевода сегмента {seg.blockid}: {e}")
-                    seg.translated_text = seg.text
-
-    logging.info("  Перевод завершён")
-
-    # 5. Экспорт результатов
-    logging.info("[5/5] Экспорт результатов...")
-
-    # Аннотированный PDF
-    try:
-        annotate_pdf_with_segments(
-            input_pdf,
-            out_pdf_annotated,
-            pages,
-            use_comments=True,  # Использовать комментарии
-            annotation_type="none",  # С подсветкой
-            include_translation=True,  # Включить перевод
-        )
-        logging.info(f"  ✓ Аннотированный PDF: {out_pdf_annotated}")
-    except Exception as e:
-        logging.error(f"  ✗ Ошибка экспорта PDF: {e}")
-
-    # DOCX с переводом
-    try:
-        export_docx(pages, out_docx, src_lang, tgt_lang)
-        logging.info(f"  ✓ DOCX с переводом: {out_docx}")
-    except Exception as e:
-        logging.error(f"  ✗ Ошибка экспорта DOCX: {e}")
+        pdf_path: Путь к PDF файлу
+        start_page: Начальная страница (1-indexed)
+        end_page: Конечная страница (1-indexed)
 
-    logging.info("[PyMuPDF Pipeline] Обработка завершена успешно!")
+    Returns:
+        Список PageBatch объектов
+    """
+    return extract_pages_pymupdf_advanced(pdf_path, start_page, end_page)
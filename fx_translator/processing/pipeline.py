@@ -12,9 +12,27 @@ import os
 import logging
 import time
 import contextlib
+import threading
 import requests
 import tempfile
-from typing import List, Dict, Tuple, Optional, Callable, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
 
 try:
     import pymupdf
@@ -22,17 +40,30 @@ except ImportError:
     import fitz as pymupdf  # type: ignore
 
 from fx_translator.core.models import PageBatch, Segment
+from fx_translator.core.exceptions import PipelineCancelled
 from fx_translator.core.config import (
     DEFAULT_HURIDOCS_BASE,
+    DEFAULT_HURIDOCS_CONCURRENCY,
     HURIDOCS_ANALYZE_PATH,
     DEFAULT_LMSTUDIO_BASE,
     LMSTUDIO_MODEL,
+    DEFAULT_LMS_CONCURRENCY,
+    DEFAULT_LMS_BATCH_CHARS,
 )
-from fx_translator.api.huridocs import huridocs_analyze_pdf, huridocs_analyze_pdf_smart
-from fx_translator.api.lmstudio import lmstudio_translate_simple
+from fx_translator.api.huridocs import (
+    huridocs_analyze_pdf_smart,
+    huridocs_analyze_pdf_stream,
+)
+from fx_translator.api.lmstudio import lmstudio_translate_batch
 from fx_translator.utils.text import parse_page_set
 from fx_translator.utils.geometry import sort_segments_reading_order
 from fx_translator.utils.metrics import init_metrics, log_metric, Timer
+from fx_translator.utils.cache import (
+    TranslationStore,
+    load_pages_cache,
+    pages_cache_path,
+    save_pages_cache,
+)
 from fx_translator.processing.analyzers.segments import (
     refine_huridocs_segments,
     deglue_pages_pdfaware,
@@ -42,48 +73,348 @@ from fx_translator.processing.analyzers.layout import (
     split_spreads_force_half,
     assert_layout_invariants,
 )
-from fx_translator.processing.extractors.pymupdf import extract_pages_pymupdf
+from fx_translator.processing.extractors.pymupdf import iter_pages_pymupdf_advanced
 from fx_translator.export.docx import export_docx
 from fx_translator.export.pdf import annotate_pdf_with_segments
 
+# Числовые поля сегмента HURIDOCS в порядке полей Segment
+_segment_nums = itemgetter(
+    "pagenumber",
+    "left",
+    "top",
+    "width",
+    "height",
+    "pagewidth",
+    "pageheight",
+)
+_N_NUMS = 7
+
+# Номера страниц до этого значения раскладываются по страницам устойчивой
+# сортировкой uint16 - в NumPy это поразрядная (корзинная) сортировка
+_RADIX_MAX_PAGE = int(np.iinfo(np.uint16).max)
+
 
-def build_pages(seg_json: List[Dict[str, Any]]) -> List[PageBatch]:
+def build_pages(seg_json: Iterable[Dict[str, Any]]) -> List[PageBatch]:
     """
     Преобразует JSON сегменты из HURIDOCS в PageBatch объекты.
 
+    seg_json может быть итератором (huridocs_analyze_pdf_stream): из каждого
+    сегмента берутся только нужные поля, без промежуточного списка словарей.
+    Числовые поля приводятся к числам одним массивом NumPy (np.fromiter по
+    плоскому потоку, без разбора списка кортежей). Порядок чтения (сверху
+    вниз, слева направо) - устойчивым lexsort, группировка по страницам -
+    устойчивой поразрядной сортировкой номеров; Segment создаются уже в
+    итоговом порядке, срезами по странице.
+
     Args:
-        seg_json: Список сегментов в JSON формате от HURIDOCS
+        seg_json: Сегменты в JSON формате от HURIDOCS (список или итератор)
 
     Returns:
         Список PageBatch с сегментами, сгруппированными по страницам
     """
-    logging.debug(f"Building pages from {len(seg_json)} segments")
-    pages: Dict[int, List[Segment]] = {}
+    nums: List[Tuple[Any, ...]] = []
+    texts: List[str] = []
+    types: List[str] = []
+    add_nums, add_text, add_type = nums.append, texts.append, types.append
 
     for it in seg_json:
-        seg = Segment(
-            pagenumber=int(it.get("pagenumber")),
-            left=float(it.get("left")),
-            top=float(it.get("top")),
-            width=float(it.get("width")),
-            height=float(it.get("height")),
-            pagewidth=float(it.get("pagewidth")),
-            pageheight=float(it.get("pageheight")),
-            text=str(it.get("text") or "").strip(),
-            type=str(it.get("type") or "Text"),
-        )
-        pages.setdefault(seg.pagenumber, []).append(seg)
+        add_nums(_segment_nums(it))
+        add_text(str(it.get("text") or "").strip())
+        add_type(str(it.get("type") or "Text"))
+
+    logging.debug(f"Building pages from {len(nums)} segments")
+    if not nums:
+        return []
+
+    arr = np.fromiter(
+        chain.from_iterable(nums), dtype=np.float64, count=_N_NUMS * len(nums)
+    ).reshape(-1, _N_NUMS)
+    pno = arr[:, 0].astype(np.int64)
+
+    # Страница, затем top, затем left; равные остаются в исходном порядке.
+    # Номера страниц плотные и небольшие: порядок чтения - lexsort по
+    # (top, left), а группировка по страницам - корзинами, без сравнений
+    if pno.min() >= 0 and pno.max() <= _RADIX_MAX_PAGE:
+        order = np.lexsort((arr[:, 1], arr[:, 2]))
+        order = order[np.argsort(pno[order].astype(np.uint16), kind="stable")]
+    else:
+        order = np.lexsort((arr[:, 1], arr[:, 2], pno))
+    pno = pno[order]
+    left, top, width, height, pw, ph = arr[order, 1:].T.tolist()
+    texts = [texts[i] for i in order.tolist()]
+    types = [types[i] for i in order.tolist()]
+
+    starts = [0] + (np.flatnonzero(np.diff(pno)) + 1).tolist()
+    ends = starts[1:] + [len(texts)]
 
     batches: List[PageBatch] = []
-    for pno in sorted(pages.keys()):
-        segs = sort_segments_reading_order(pages[pno])
-        for idx, s in enumerate(segs, start=1):
-            s.blockid = idx
-        batches.append(PageBatch(pagenumber=pno, segments=segs))
+    for a, b in zip(starts, ends):
+        page = int(pno[a])
+        segs = list(
+            map(
+                Segment,
+                repeat(page, b - a),
+                left[a:b],
+                top[a:b],
+                width[a:b],
+                height[a:b],
+                pw[a:b],
+                ph[a:b],
+                texts[a:b],
+                types[a:b],
+                range(1, b - a + 1),
+            )
+        )
+        batches.append(PageBatch(pagenumber=page, segments=segs))
 
     return batches
 
 
+def _iter_postsplit_pages(
+    pages: List[PageBatch],
+    doc: pymupdf.Document,
+    chunk_size: int,
+    out: List[PageBatch],
+) -> Iterator[PageBatch]:
+    """
+    Вторая волна обработки (после сплита) пачками по chunk_size страниц.
+
+    Готовые страницы отдаются сразу, поэтому перевод первых пачек идёт,
+    пока обрабатываются следующие. Каждая отданная страница также
+    добавляется в out - для экспорта после перевода.
+
+    Повторный deglue нужен только страницам, которые разделил сплит
+    или изменила рафинировка с новыми допусками (skip_unchanged).
+    """
+    step = max(1, chunk_size)
+    for i in range(0, len(pages), step):
+        refined = deglue_pages_pdfaware(
+            pages[i : i + step],
+            pdf_path=doc,
+            refine=partial(refine_huridocs_segments, xtol=9.0, gaptol=10.0),
+            skip_unchanged=True,
+        )
+
+        for pb in refined:
+            out.append(pb)
+            yield pb
+
+
+def _iter_pymupdf_pages(
+    pages: Iterable[PageBatch],
+    doc: pymupdf.Document,
+    out: List[PageBatch],
+    split_spreads_enabled: bool,
+    force_split_spreads: bool,
+    force_split_exceptions: str,
+    use_llm_grouping: bool,
+    lms_model: str,
+    lms_base: str,
+) -> Iterator[PageBatch]:
+    """
+    Сплит разворотов и LLM-группировка для потока страниц PyMuPDF.
+
+    Обе операции работают постранично, поэтому страница уходит в перевод
+    сразу после извлечения, а не после разбора всего документа. Каждая
+    отданная логическая страница также добавляется в out - для экспорта
+    после перевода.
+    """
+    exceptions = (
+        parse_page_set(force_split_exceptions, doc.page_count)
+        if split_spreads_enabled and force_split_spreads
+        else set()
+    )
+
+    extracted = 0
+    for pb in pages:
+        extracted += 1
+        logical = [pb]
+
+        # Разделение разворотов
+        if split_spreads_enabled:
+            if force_split_spreads:
+                logical = split_spreads_force_half(logical, exceptions)
+            else:
+                logical = split_spreads(logical, pdf_path=doc, debug=True)
+
+        # Дополнительная LLM-группировка ролей (опционально)
+        if use_llm_grouping:
+            grouped: List[PageBatch] = []
+            for lp in logical:
+                try:
+                    payload = featurize_segments_for_llm(lp)
+                    grouping = llm_group_segments(
+                        model=lms_model, lms_base=lms_base, page_payload=payload
+                    )
+                    grouped.append(apply_llm_groups(lp, grouping))
+                except Exception as e:
+                    logging.warning(
+                        f"LLM grouping failed on page {lp.pagenumber}: {e} "
+                        f"— using passthrough"
+                    )
+                    grouped.append(lp)
+            logical = grouped
+
+        # Разметка дальше не меняется - проверяем её до перевода
+        assert_layout_invariants(logical)
+
+        for lp in logical:
+            out.append(lp)
+            yield lp
+
+    if split_spreads_enabled:
+        logging.info(
+            "Извлечено %d страниц, после сплита (%s) логических страниц: %d.",
+            extracted,
+            "force-half" if force_split_spreads else "auto",
+            len(out),
+        )
+    else:
+        logging.info("Извлечено %d страниц.", extracted)
+
+
+def wait_or_cancel(pause_ms: int, cancel_event: Optional[threading.Event]) -> None:
+    """
+    Пауза между запросами к LM Studio, которую прерывает отмена.
+
+    В отличие от time.sleep, выставленный cancel_event обрывает ожидание
+    сразу. При pause_ms <= 0 только проверяет отмену.
+
+    Args:
+        pause_ms: Пауза в мс
+        cancel_event: Событие отмены (None - обработку отменить нельзя)
+
+    Raises:
+        PipelineCancelled: Если cancel_event выставлен
+    """
+    if cancel_event is None:
+        if pause_ms > 0:
+            time.sleep(pause_ms / 1000.0)
+        return
+
+    if cancel_event.wait(timeout=max(pause_ms, 0) / 1000.0):
+        raise PipelineCancelled("Обработка отменена")
+
+
+def _translate_pages_concurrent(
+    pages: Iterable[PageBatch],
+    lms_model: str,
+    src_lang: str,
+    tgt_lang: str,
+    lms_base: str,
+    concurrency: int = DEFAULT_LMS_CONCURRENCY,
+    batch_size: int = 1,
+    pause_ms: int = 0,
+    pause_hook: Optional[Callable[[], None]] = None,
+    store: Optional[TranslationStore] = None,
+    cancel_event: Optional[threading.Event] = None,
+    keep: Optional[Callable[[Segment], bool]] = None,
+    batch_chars: int = DEFAULT_LMS_BATCH_CHARS,
+) -> List[List[str]]:
+    """
+    Переводит страницы через LM Studio в нескольких потоках.
+
+    Непустые сегменты batch_size подряд идущих страниц уходят в LM Studio
+    одним запросом (lmstudio_translate_batch): меньше HTTP-запросов и
+    накладных расходов модели на каждый. Запросы упираются в сеть и модель,
+    а не в CPU, поэтому пачки переводятся параллельно. В работе одновременно
+    не больше concurrency пачек: следующая отправляется, только когда
+    освободился слот, так что pause_hook по-прежнему останавливает подачу.
+
+    Пачка закрывается раньше batch_size страниц, если следующая страница
+    вывела бы текст запроса за batch_chars символов: длинные страницы не
+    переполняют контекст модели. Страницы не делятся, так что страница
+    длиннее предела уходит отдельным запросом.
+
+    pages может быть генератором: пачка отправляется, как только набрано
+    batch_size непустых страниц, не дожидаясь остальных.
+
+    Args:
+        pages: Страницы для перевода (список или итератор)
+        lms_model: Название модели в LM Studio
+        src_lang: Исходный язык
+        tgt_lang: Целевой язык
+        lms_base: URL LM Studio API
+        concurrency: Число одновременно переводимых пачек
+        batch_size: Число страниц в одном запросе
+        pause_ms: Пауза между отправкой пачек в мс
+        pause_hook: Callback функция для паузы
+        store: Дисковый кэш переводов (опционально)
+        cancel_event: Событие отмены: новые пачки больше не отправляются
+        keep: Дополнительный фильтр сегментов для перевода (остальные
+            получают пустой перевод)
+        batch_chars: Предел текста в одном запросе, символов (0 - без предела)
+
+    Returns:
+        Переводы по страницам в порядке pages: translations[i][blockid - 1]
+        (пустая строка для пустых сегментов)
+    """
+    workers = max(1, concurrency)
+    step = max(1, batch_size)
+    slots = threading.BoundedSemaphore(workers)
+    translations: List[List[str]] = []
+    submitted: List[Tuple[Future, List[Tuple[List[str], int]]]] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+
+        def _submit(chunk: List[Tuple[Tuple[List[str], int], str]]) -> None:
+            if pause_hook:
+                pause_hook()
+            wait_or_cancel(0, cancel_event)
+
+            slots.acquire()
+            fut = ex.submit(
+                lmstudio_translate_batch,
+                texts=[text for _, text in chunk],
+                src_lang=src_lang,
+                tgt_lang=tgt_lang,
+                lms_base=lms_base,
+                lms_model=lms_model,
+                store=store,
+            )
+            fut.add_done_callback(lambda _: slots.release())
+            submitted.append((fut, [key for key, _ in chunk]))
+
+            wait_or_cancel(pause_ms, cancel_event)
+
+        # Пустые сегменты и страницы в пачки не попадают. Ключ перевода -
+        # строка страницы и индекс blockid - 1 в ней
+        chunk: List[Tuple[Tuple[List[str], int], str]] = []
+        chunk_pages = chunk_chars = 0
+        for page_batch in pages:
+            row = [""] * max((s.blockid for s in page_batch.segments), default=0)
+            translations.append(row)
+            page = [
+                ((row, s.blockid - 1), s.text)
+                for s in page_batch.segments
+                if s.blockid > 0 and s.text.strip() and (keep is None or keep(s))
+            ]
+            if not page:
+                continue
+
+            page_chars = sum(len(text) for _, text in page)
+            if chunk and 0 < batch_chars < chunk_chars + page_chars:
+                _submit(chunk)
+                chunk, chunk_pages, chunk_chars = [], 0, 0
+
+            chunk.extend(page)
+            chunk_pages += 1
+            chunk_chars += page_chars
+            if chunk_pages == step:
+                _submit(chunk)
+                chunk, chunk_pages, chunk_chars = [], 0, 0
+
+        if chunk:
+            _submit(chunk)
+
+    # Результаты раскладываются в порядке страниц, а не завершения запросов
+    for fut, keys in submitted:
+        for (row, k), text in zip(keys, fut.result()):
+            row[k] = text
+
+    return translations
+
+
 def run_pipeline(
     input_pdf: str,
     out_pdf_annotated: str,
@@ -105,6 +436,9 @@ def run_pipeline(
     end_page: Optional[int] = None,
     split_spreads_enabled: bool = True,
     fast=False,
+    lms_concurrency: int = DEFAULT_LMS_CONCURRENCY,
+    ignore_cache: bool = False,
+    cancel_event: Optional[threading.Event] = None,
 ) -> None:
     """
     Стандартный конвейер обработки PDF через HURIDOCS.
@@ -129,7 +463,7 @@ def run_pipeline(
         lms_base: URL LM Studio API
         lms_model: Название модели в LM Studio
 
-        batch_size: Размер батча для обработки
+        batch_size: Число страниц в одном запросе к LM Studio
         force_split_spreads: Принудительно делить развороты пополам
         force_split_exceptions: Страницы-исключения для split (формат: "1,3-5,10")
         page_limit: Ограничение количества страниц (для тестирования)
@@ -138,91 +472,163 @@ def run_pipeline(
         start_page: Начальная страница (1-based)
         end_page: Конечная страница (1-based)
         split_spreads_enabled: Включить разделение разворотов
+        lms_concurrency: Число страниц, одновременно переводимых в LM Studio
+        ignore_cache: Не использовать дисковый кэш разметки и переводов
+        cancel_event: Событие отмены перевода (см. wait_or_cancel)
     """
     init_metrics(out_docx)
 
     logging.info("Шаг 1/3: Анализ макета через HURIDOCS...")
-    seg_json = huridocs_analyze_pdf(
-        input_pdf, huridocs_base, huridocs_analyze_path, fast=False
+    # Разметка зависит от сервера HURIDOCS: другой адрес - другой ключ
+    cache_path = (
+        None
+        if ignore_cache
+        else pages_cache_path(
+            input_pdf,
+            "huridocs",
+            huridocs_base.rstrip("/"),
+            huridocs_analyze_path,
+            False,
+        )
     )
-    pages = build_pages(seg_json)
+    pages = load_pages_cache(cache_path) if cache_path else None
 
-    # Мягкая волна обработки до сплита
-    pages = [refine_huridocs_segments(pb) for pb in pages]
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
-
-    # Ограничение диапазона страниц
+    if pages is None:
+        seg_json = huridocs_analyze_pdf_stream(
+            input_pdf, huridocs_base, huridocs_analyze_path, fast=False
+        )
+        pages = build_pages(seg_json)
+        if cache_path:
+            save_pages_cache(cache_path, pages)
+    else:
+        logging.info("Разметка HURIDOCS взята из кэша: %s", cache_path)
+
+    # Ограничение диапазона страниц - до первой волны: она обрабатывает
+    # страницы независимо, и остальные страницы ей незачем
     if start_page is not None and end_page is not None:
         pages = pages[start_page - 1 : end_page]
     elif page_limit and len(pages) > page_limit:
         pages = pages[:page_limit]
 
-    # Разделение разворотов
-    if split_spreads_enabled:
-        total_pages = max((pb.pagenumber for pb in pages), default=0)
-        if force_split_spreads:
-            ex = parse_page_set(force_split_exceptions, total_pages)
-            pages = split_spreads_force_half(pages, ex)
-            logging.info(
-                "После сплита (force-half, исключения=%s) логических страниц: %d.",
-                sorted(list(ex)) if ex else "∅",
-                len(pages),
+    # Мягкая волна обработки до сплита: рафинировка идёт в воркерах deglue
+    pages = deglue_pages_pdfaware(
+        pages, pdf_path=input_pdf, refine=refine_huridocs_segments
+    )
+
+    # Дальше PDF открыт один раз на все этапы: сплит, вторая волна и
+    # аннотация работают с одним документом. Первая волна выше получает
+    # путь: на больших документах deglue раздаёт страницы пулу процессов,
+    # а открытый документ в другой процесс не передать
+    doc = pymupdf.open(input_pdf)
+    try:
+        # Разделение разворотов
+        if split_spreads_enabled:
+            total_pages = max((pb.pagenumber for pb in pages), default=0)
+            if force_split_spreads:
+                ex = parse_page_set(force_split_exceptions, total_pages)
+                pages = split_spreads_force_half(pages, ex)
+                logging.info(
+                    "После сплита (force-half, исключения=%s) логических страниц: %d.",
+                    sorted(list(ex)) if ex else "∅",
+                    len(pages),
+                )
+            else:
+                pages = split_spreads(pages, pdf_path=doc, debug=True)
+                logging.info("После сплита (auto) логических страниц: %d.", len(pages))
+
+        # Шаг 2: Мягкая волна обработки после сплита и перевод. Волна идёт
+        # пачками по batch_size страниц, и готовые пачки переводятся, пока
+        # обрабатываются следующие
+        logging.info("Шаг 2/3: Перевод страниц через LM Studio...")
+        processed: List[PageBatch] = []
+        store = None if ignore_cache else TranslationStore()
+        try:
+            translations = _translate_pages_concurrent(
+                _iter_postsplit_pages(pages, doc, batch_size, processed),
+                lms_model=lms_model,
+                src_lang=src_lang,
+                tgt_lang=tgt_lang,
+                lms_base=lms_base,
+                concurrency=lms_concurrency,
+                batch_size=batch_size,
+                pause_ms=pause_ms,
+                pause_hook=pause_hook,
+                store=store,
+                cancel_event=cancel_event,
             )
-        else:
-            pages = split_spreads(pages, pdf_path=input_pdf, debug=True)
-            logging.info("После сплита (auto) логических страниц: %d.", len(pages))
-
-    # Мягкая волна обработки после сплита
-    pages = [refine_huridocs_segments(pb, xtol=9.0, gaptol=10.0) for pb in pages]
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
-
-    # Шаг 2: Перевод
-    logging.info("Шаг 2/3: Перевод страниц через LM Studio...")
-    translations: Dict[Tuple[int, str, int], str] = {}
-
-    for page_batch in pages:
-        if pause_hook:
-            pause_hook()
-
-        segs_nonempty = [s for s in page_batch.segments if s.text.strip()]
-        if not segs_nonempty:
-            if pause_ms > 0:
-                time.sleep(pause_ms / 1000.0)
-            continue
-
-        page_map = lmstudio_translate_simple(
-            model=lms_model,
-            pagenumber=page_batch.pagenumber,
-            segments=segs_nonempty,
-            src_lang=src_lang,
-            tgt_lang=tgt_lang,
-            base_url=lms_base,
+        finally:
+            if store is not None:
+                store.close()
+        pages = processed
+
+        # Шаг 3: Вывод
+        logging.info("Шаг 3/3: Генерация вывода (PDF + DOCX)...")
+        assert_layout_invariants(pages)
+        annotate_pdf_with_segments(
+            doc,
+            out_pdf_annotated,
+            pages,
+            use_comments=True,  # Использовать комментарии
+            annotation_type="none",  # С подсветкой
+            include_translation=True,  # Включить перевод
         )
+    finally:
+        doc.close()
 
-        side = getattr(page_batch, "logical_side", "")
-        for s in segs_nonempty:
-            translations[(page_batch.pagenumber, side, s.blockid)] = page_map.get(
-                s.blockid, ""
-            )
+    export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
 
-        if pause_ms > 0:
-            time.sleep(pause_ms / 1000.0)
+    logging.info(f"Готово: {out_pdf_annotated} и {out_docx}")
 
-    # Шаг 3: Вывод
-    logging.info("Шаг 3/3: Генерация вывода (PDF + DOCX)...")
-    assert_layout_invariants(pages)
-    annotate_pdf_with_segments(
-        input_pdf,
-        out_pdf_annotated,
-        pages,
-        use_comments=True,  # Использовать комментарии
-        annotation_type="none",  # С подсветкой
-        include_translation=True,  # Включить перевод
-    )
 
-    export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
+def _analyze_page_file(
+    tmp_path: str,
+    pno: int,
+    pw: float,
+    ph: float,
+    base_url: str,
+    analyze_path: str,
+    timeout: int,
+    fast: bool,
+) -> Optional[PageBatch]:
+    """
+    Анализирует одностраничный PDF через HURIDOCS и удаляет его.
 
-    logging.info(f"Готово: {out_pdf_annotated} и {out_docx}")
+    Работает без документа PyMuPDF, поэтому может выполняться в потоке.
+
+    Args:
+        tmp_path: Путь к временному PDF с одной страницей
+        pno: Номер страницы в исходном документе (1-based)
+        pw: Ширина страницы
+        ph: Высота страницы
+        base_url: URL HURIDOCS API
+        analyze_path: Путь endpoint анализа
+        timeout: Таймаут запроса в секундах
+        fast: Быстрый режим HURIDOCS
+
+    Returns:
+        PageBatch страницы или None, если сегментов нет
+    """
+    try:
+        seg_json = huridocs_analyze_pdf_smart(
+            tmp_path,
+            base_url=base_url,
+            analyze_path=analyze_path,
+            timeout=timeout,
+            fast=fast,
+        )
+
+        # Корректируем номера страниц
+        for it in seg_json:
+            it["pagenumber"] = pno
+            it["pagewidth"] = pw
+            it["pageheight"] = ph
+
+        batches = build_pages(seg_json)
+        return batches[0] if batches else None
+
+    finally:
+        with contextlib.suppress(Exception):
+            os.remove(tmp_path)
 
 
 def analyze_pdf_transactional(
@@ -235,6 +641,7 @@ def analyze_pdf_transactional(
     end_page: Optional[int] = None,
     per_page_timeout: int = 1200,
     fast: bool = False,
+    analyze_concurrency: int = DEFAULT_HURIDOCS_CONCURRENCY,
 ) -> List[PageBatch]:
     """
     Постраничный анализ с умным управлением контейнером.
@@ -244,6 +651,11 @@ def analyze_pdf_transactional(
     - Отправляет на анализ в HURIDOCS
     - Управляет перезапуском контейнера при необходимости
 
+    Без периодического перезапуска (restart_every=0) в HURIDOCS уходит до
+    analyze_concurrency страниц одновременно. Временные PDF готовятся в
+    основном потоке (документ PyMuPDF не потокобезопасен), ошибки
+    разбираются в порядке страниц, как и при последовательной работе.
+
     Args:
         input_pdf: Путь к входному PDF файлу
         huridocs_base: URL HURIDOCS API
@@ -253,6 +665,8 @@ def analyze_pdf_transactional(
         start_page: Начальная страница (1-based)
         end_page: Конечная страница (1-based)
         per_page_timeout: Таймаут на обработку одной страницы
+        analyze_concurrency: Число страниц, одновременно анализируемых
+            HURIDOCS (при restart_every > 0 всегда 1)
 
     Returns:
         Список PageBatch объектов
@@ -280,89 +694,111 @@ def analyze_pdf_transactional(
             orchestrator.start_huridocs(lambda m: None)
             base_url = orchestrator.get_base_url()
 
+        workers = max(1, analyze_concurrency) if restart_every <= 0 else 1
         out_batches: List[PageBatch] = []
-
-        for idx, pno in enumerate(range(p_start, p_end + 1), 1):
-            # Перезапуск контейнера каждые N страниц
-            if (
-                orchestrator
-                and restart_every > 0
-                and idx > 1
-                and (idx - 1) % restart_every == 0
-            ):
-                with contextlib.suppress(Exception):
-                    orchestrator.stop_huridocs(lambda m: None)
-                    orchestrator.start_huridocs(lambda m: None)
-                    base_url = orchestrator.get_base_url()
-
-            tmp_path: Optional[str] = None
-
-            try:
-                # Извлекаем одну страницу
-                page_idx = pno - 1
-                page = doc[page_idx]
-                pw, ph = page.rect.width, page.rect.height
-
-                # Создаём временный PDF с одной страницей
-                out_doc = pymupdf.open()
-                out_doc.insert_pdf(doc, from_page=page_idx, to_page=page_idx)
-
-                import tempfile
-
-                fd, tmp_path = tempfile.mkstemp(prefix=f"page-{pno}-", suffix=".pdf")
-                os.close(fd)
-
-                out_doc.save(tmp_path, garbage=4, deflate=True)
-                out_doc.close()
-
-                # Анализируем через HURIDOCS
-                seg_json = huridocs_analyze_pdf_smart(
-                    tmp_path,
-                    base_url=base_url,
-                    analyze_path=analyze_path,
-                    timeout=per_page_timeout,
-                    fast=fast,
-                )
-
-                # Корректируем номера страниц
-                for it in seg_json:
-                    it["pagenumber"] = pno
-                    it["pagewidth"] = pw
-                    it["pageheight"] = ph
-
-                batches = build_pages(seg_json)
-                if batches:
-                    out_batches.append(batches[0])
-
-            except (requests.Timeout, requests.ConnectionError) as e:
-                logging.warning(
-                    f"Страница {pno}: таймаут/ошибка соединения HURIDOCS. Попытка перезапуска..."
-                )
-                if orchestrator and orchestrator.maybe_restart_on_failure(
-                    lambda m: None, err=e
+        pending: Deque[Tuple[int, Future]] = deque()
+
+        def _collect(keep: int) -> None:
+            # Забирает результаты старейших запросов, пока в работе больше keep
+            nonlocal base_url
+
+            while len(pending) > keep:
+                pno, fut = pending.popleft()
+                try:
+                    batch = fut.result()
+                    if batch is not None:
+                        out_batches.append(batch)
+
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    logging.warning(
+                        f"Страница {pno}: таймаут/ошибка соединения HURIDOCS. "
+                        f"Попытка перезапуска..."
+                    )
+                    if orchestrator and orchestrator.maybe_restart_on_failure(
+                        lambda m: None, err=e
+                    ):
+                        base_url = orchestrator.get_base_url()
+
+                except requests.HTTPError as e:
+                    status_code = getattr(e.response, "status_code", None)
+                    logging.warning(
+                        f"Страница {pno}: HTTP ошибка {status_code} от HURIDOCS. "
+                        f"Попытка перезапуска..."
+                    )
+                    if orchestrator and orchestrator.maybe_restart_on_failure(
+                        lambda m: None, status_code=status_code
+                    ):
+                        base_url = orchestrator.get_base_url()
+
+                except Exception as e:
+                    logging.warning(f"Страница {pno}: общая ошибка анализа — {e}")
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for idx, pno in enumerate(range(p_start, p_end + 1), 1):
+                # Перезапуск контейнера каждые N страниц
+                if (
+                    orchestrator
+                    and restart_every > 0
+                    and idx > 1
+                    and (idx - 1) % restart_every == 0
                 ):
-                    base_url = orchestrator.get_base_url()
+                    with contextlib.suppress(Exception):
+                        orchestrator.stop_huridocs(lambda m: None)
+                        orchestrator.start_huridocs(lambda m: None)
+                        base_url = orchestrator.get_base_url()
+
+                tmp_path: Optional[str] = None
+
+                try:
+                    # Извлекаем одну страницу
+                    page_idx = pno - 1
+                    page = doc[page_idx]
+                    pw, ph = page.rect.width, page.rect.height
+
+                    # Создаём временный PDF с одной страницей. insert_pdf
+                    # копирует только объекты этой страницы, потоки уже
+                    # сжаты - сборка мусора и deflate при сохранении лишь
+                    # тратят время. Файл, а не tobytes(): PyMuPDF пишет байты
+                    # через Python-callback мелкими кусками, это в 2-3 раза
+                    # медленнее записи на диск
+                    out_doc = pymupdf.open()
+                    out_doc.insert_pdf(doc, from_page=page_idx, to_page=page_idx)
+
+                    fd, tmp_path = tempfile.mkstemp(
+                        prefix=f"page-{pno}-", suffix=".pdf"
+                    )
+                    os.close(fd)
+
+                    out_doc.save(tmp_path)
+                    out_doc.close()
+
+                except Exception as e:
+                    logging.warning(f"Страница {pno}: общая ошибка анализа — {e}")
+                    if tmp_path:
+                        with contextlib.suppress(Exception):
+                            os.remove(tmp_path)
                     continue
 
-            except requests.HTTPError as e:
-                status_code = getattr(e.response, "status_code", None)
-                logging.warning(
-                    f"Страница {pno}: HTTP ошибка {status_code} от HURIDOCS. Попытка перезапуска..."
+                # Анализируем через HURIDOCS (временный файл удаляет воркер)
+                pending.append(
+                    (
+                        pno,
+                        ex.submit(
+                            _analyze_page_file,
+                            tmp_path,
+                            pno,
+                            pw,
+                            ph,
+                            base_url,
+                            analyze_path,
+                            per_page_timeout,
+                            fast,
+                        ),
+                    )
                 )
-                if orchestrator and orchestrator.maybe_restart_on_failure(
-                    lambda m: None, status_code=status_code
-                ):
-                    base_url = orchestrator.get_base_url()
-                    continue
+                _collect(workers - 1)
 
-            except Exception as e:
-                logging.warning(f"Страница {pno}: общая ошибка анализа — {e}")
-                continue
-
-            finally:
-                if tmp_path and os.path.exists(tmp_path):
-                    with contextlib.suppress(Exception):
-                        os.remove(tmp_path)
+            _collect(0)
 
         # Останавливаем контейнер после обработки
         if orchestrator:
@@ -375,6 +811,27 @@ def analyze_pdf_transactional(
         doc.close()
 
 
+# Типы сегментов, которые транзакционный конвейер переводит всегда
+_ALWAYS_TRANSLATE_TYPES = frozenset(
+    ("title", "section_header", "caption", "page_header")
+)
+
+
+def _for_translation(s: Segment) -> bool:
+    """Фильтр транзакционного конвейера: всё, кроме пустых и номеров страниц."""
+    t = (s.text or "").strip()
+
+    if not t:
+        return False
+
+    # ✅ Переводим ВСЕ заголовки
+    if s.type in _ALWAYS_TRANSLATE_TYPES:
+        return True
+
+    # Пропускаем только номера страниц, остальное переводим
+    return not (s.type == "page_footer" and t.isdigit())
+
+
 def run_pipeline_transactional(
     input_pdf: str,
     out_pdf_annotated: str,
@@ -396,6 +853,11 @@ def run_pipeline_transactional(
     pause_hook: Optional[Callable[[], None]] = None,
     split_spreads_enabled: bool = True,
     fast: bool = False,
+    cancel_event: Optional[threading.Event] = None,
+    checkpoint_every: int = 0,
+    lms_concurrency: int = DEFAULT_LMS_CONCURRENCY,
+    ignore_cache: bool = False,
+    analyze_concurrency: int = DEFAULT_HURIDOCS_CONCURRENCY,
 ) -> None:
     """
     Транзакционный постраничный конвейер с управлением контейнером.
@@ -405,6 +867,8 @@ def run_pipeline_transactional(
     - Автоматический перезапуск контейнера при сбоях
     - Периодический перезапуск каждые N страниц
     - Только мягкие правки сегментов (без переклассификации)
+    - Промежуточный DOCX каждые checkpoint_every переведённых страниц:
+      сбой LM Studio посреди документа не теряет уже сделанный перевод
 
     Args:
         input_pdf: Путь к входному PDF файлу
@@ -416,7 +880,7 @@ def run_pipeline_transactional(
         huridocs_analyze_path: Путь endpoint анализа
         lms_base: URL LM Studio API
         LMSTUDIO_MODEL: Название модели
-        batch_size: Размер батча для обработки
+        batch_size: Число страниц в одном запросе к LM Studio
         force_split_spreads: Принудительное деление разворотов
         force_split_exceptions: Страницы-исключения для split
         orchestrator: Объект Orchestrator для управления контейнером
@@ -426,6 +890,11 @@ def run_pipeline_transactional(
         pause_ms: Пауза между страницами
         pause_hook: Callback для паузы
         split_spreads_enabled: Включить разделение разворотов
+        cancel_event: Событие отмены перевода (см. wait_or_cancel)
+        checkpoint_every: Сохранять DOCX каждые N страниц перевода (0 = только в конце)
+        lms_concurrency: Число страниц, одновременно переводимых в LM Studio
+        ignore_cache: Не использовать дисковый кэш переводов
+        analyze_concurrency: Число страниц, одновременно анализируемых HURIDOCS
     """
     init_metrics(out_docx)
 
@@ -440,108 +909,156 @@ def run_pipeline_transactional(
         end_page=end_page,
         per_page_timeout=1200,
         fast=fast,
+        analyze_concurrency=analyze_concurrency,
     )
 
-    # Мягкая волна до сплита
-    pages = [refine_huridocs_segments(pb) for pb in pages]
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
-
-    # Сплит разворотов
-    if split_spreads_enabled:
-        total_pages = max((pb.pagenumber for pb in pages), default=0)
-        if force_split_spreads:
-            ex = parse_page_set(force_split_exceptions, total_pages)
-            pages = split_spreads_force_half(pages, ex)
-            logging.info(
-                "После сплита (force-half, исключения=%s) логических страниц: %d.",
-                sorted(list(ex)) if ex else "∅",
-                len(pages),
-            )
-        else:
-            pages = split_spreads(pages, pdf_path=input_pdf, debug=True)
-            logging.info("После сплита (auto) логических страниц: %d.", len(pages))
-
-    # Мягкая волна после сплита
-    pages = [refine_huridocs_segments(pb, xtol=9.0, gaptol=10.0) for pb in pages]
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
-
-    # Перевод (фильтруем минимально значимые сегменты)
-    logging.info("Шаг 3/4: перевод через LM Studio...")
-    translations: Dict[Tuple[int, str, int], str] = {}
-
-    for page_batch in pages:
-        if pause_hook:
-            pause_hook()
-
-        def _for_translation(s: Segment) -> bool:
-            t = (s.text or "").strip()
-
-            if not t:
-                return False
-
-            # ✅ Переводим ВСЕ заголовки
-            if s.type in ("title", "section_header", "caption", "page_header"):
-                return True
-
-            # Пропускаем только номера страниц
-            if t.isdigit() and s.type == "page_footer":
-                return False
-
-            # Переводим всё остальное
-            return True
-
-        segs_for_translation = [s for s in page_batch.segments if _for_translation(s)]
+    # Мягкая волна до сплита (рафинировка - в воркерах deglue)
+    pages = deglue_pages_pdfaware(
+        pages, pdf_path=input_pdf, refine=refine_huridocs_segments
+    )
 
-        page_map = lmstudio_translate_simple(
-            model=lms_model,
-            pagenumber=page_batch.pagenumber,
-            segments=segs_for_translation,
-            src_lang=src_lang,
-            tgt_lang=tgt_lang,
-            base_url=lms_base,
+    # Дальше PDF открыт один раз: сплит, вторая волна и аннотация работают
+    # с одним документом (первая волна выше раздаёт страницы пулу
+    # процессов, ей нужен путь)
+    doc = pymupdf.open(input_pdf)
+    try:
+        # Сплит разворотов
+        if split_spreads_enabled:
+            total_pages = max((pb.pagenumber for pb in pages), default=0)
+            if force_split_spreads:
+                ex = parse_page_set(force_split_exceptions, total_pages)
+                pages = split_spreads_force_half(pages, ex)
+                logging.info(
+                    "После сплита (force-half, исключения=%s) логических страниц: %d.",
+                    sorted(list(ex)) if ex else "∅",
+                    len(pages),
+                )
+            else:
+                pages = split_spreads(pages, pdf_path=doc, debug=True)
+                logging.info("После сплита (auto) логических страниц: %d.", len(pages))
+
+        # Мягкая волна после сплита: повторный deglue - только страницам,
+        # которые изменили сплит или рафинировка
+        pages = deglue_pages_pdfaware(
+            pages,
+            pdf_path=doc,
+            refine=partial(refine_huridocs_segments, xtol=9.0, gaptol=10.0),
+            skip_unchanged=True,
         )
 
-        side = getattr(page_batch, "logical_side", "")
-        for s in segs_for_translation:
-            logging.info(
-                f"Block {s.blockid}: original text = '{s.text}' (type: {s.type})"
-            )
-            translations[(page_batch.pagenumber, side, s.blockid)] = page_map.get(
-                s.blockid, ""
-            )
-
-        if pause_ms > 0:
-            time.sleep(pause_ms / 1000.0)
+        # Разметка дальше не меняется: проверяем её до перевода, чтобы не
+        # тратить запросы к модели на документ, который не выпустить
+        assert_layout_invariants(pages)
+
+        # Перевод (фильтруем минимально значимые сегменты)
+        logging.info("Шаг 3/4: перевод через LM Studio...")
+
+        # Построчный отладочный вывод - только при уровне DEBUG: на больших
+        # документах это десятки тысяч сообщений
+        debug_log = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        # Страницы переводятся параллельно окнами по checkpoint_every страниц:
+        # после каждого окна - контрольная точка
+        translations: List[List[str]] = []
+        window = checkpoint_every if checkpoint_every > 0 else max(len(pages), 1)
+
+        store = None if ignore_cache else TranslationStore()
+        try:
+            for start in range(0, len(pages), window):
+                chunk = pages[start : start + window]
+                if debug_log:
+                    for page_batch in chunk:
+                        for s in page_batch.segments:
+                            if _for_translation(s):
+                                logging.debug(
+                                    "Block %d: original text = %r (type: %s)",
+                                    s.blockid,
+                                    s.text,
+                                    s.type,
+                                )
+
+                translations.extend(
+                    _translate_pages_concurrent(
+                        chunk,
+                        lms_model=lms_model,
+                        src_lang=src_lang,
+                        tgt_lang=tgt_lang,
+                        lms_base=lms_base,
+                        concurrency=lms_concurrency,
+                        batch_size=batch_size,
+                        pause_ms=pause_ms,
+                        pause_hook=pause_hook,
+                        store=store,
+                        cancel_event=cancel_event,
+                        keep=_for_translation,
+                    )
+                )
 
-    # Вывод
-    logging.info("Шаг 4/4: генерация аннотированного PDF и DOCX...")
-    assert_layout_invariants(pages)
-    annotate_pdf_with_segments(
-        input_pdf,
-        out_pdf_annotated,
-        pages,
-        use_comments=True,  # Использовать комментарии
-        annotation_type="none",  # С подсветкой
-        include_translation=True,  # Включить перевод
-    )
+                # Контрольная точка: DOCX по уже переведённым страницам (итоговый
+                # экспорт ниже его перезапишет)
+                done = len(translations)
+                if checkpoint_every > 0 and done < len(pages):
+                    try:
+                        export_docx(
+                            pages[:done],
+                            translations,
+                            out_docx,
+                            title=os.path.basename(input_pdf),
+                        )
+                        logging.info(
+                            f"Контрольная точка: {done}/{len(pages)} стр. → {out_docx}"
+                        )
+                    except Exception as e:
+                        logging.warning(f"Контрольная точка DOCX не сохранена: {e}")
+        finally:
+            if store is not None:
+                store.close()
+
+        # Вывод
+        logging.info("Шаг 4/4: генерация аннотированного PDF и DOCX...")
+        annotate_pdf_with_segments(
+            doc,
+            out_pdf_annotated,
+            pages,
+            use_comments=True,  # Использовать комментарии
+            annotation_type="none",  # С подсветкой
+            include_translation=True,  # Включить перевод
+        )
+    finally:
+        doc.close()
     # Отладочный вывод
-    logging.info(f"Total translations: {len(translations)}")
+    total = sum(1 for row in translations for t in row if t)
+    logging.info(f"Total translations: {total}")
 
-    # Группируем по страницам
-    from collections import defaultdict
+    # Логируем по страницам
+    if debug_log:
+        for pb, row in zip(pages, translations):
+            logging.debug(
+                "Page (%d, %s): %d translations",
+                pb.pagenumber,
+                pb.logical_side,
+                sum(1 for t in row if t),
+            )
+            for blockid, trans_text in enumerate(row, 1):
+                if trans_text:
+                    logging.debug("  Block %d: %s...", blockid, trans_text[:50])
 
-    by_page = defaultdict(dict)
+    export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
 
-    for (pno, side, blockid), trans_text in translations.items():
-        by_page[(pno, side)][blockid] = trans_text
 
-    # Логируем по страницам
-    for (pno, side), trans_dict in by_page.items():
-        logging.info(f"Page ({pno}, {side}): {len(trans_dict)} translations")
-        for blockid, trans_text in trans_dict.items():
-            logging.info(f"  Block {blockid}: {trans_text[:50]}...")
+def _in_reading_order(segments: List[Segment]) -> bool:
+    """
+    Проверяет, что сегменты уже идут в порядке чтения с blockid = 1..n.
 
-    export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
+    Такой список sort_segments_reading_order с перенумерацией не изменит.
+    """
+    prev: Optional[Tuple[float, float]] = None
+    for i, s in enumerate(segments, 1):
+        key = (s.top, s.left)
+        if s.blockid != i or (prev is not None and key < prev):
+            return False
+        prev = key
+    return True
 
 
 def featurize_segments_for_llm(pb: PageBatch) -> Dict[str, Any]:
@@ -554,8 +1071,14 @@ def featurize_segments_for_llm(pb: PageBatch) -> Dict[str, Any]:
     Returns:
         Словарь с данными сегментов для LLM
     """
+    # Экстрактор, сплит и рафинировка отдают сегменты уже в порядке чтения
+    # с blockid = 1..n - пересортировка нужна, только если это не так
+    segs = pb.segments
+    if not _in_reading_order(segs):
+        segs = sort_segments_reading_order(segs)
+
     feats = []
-    for s in sort_segments_reading_order(pb.segments):
+    for s in segs:
         feats.append(
             {
                 "blockid": s.blockid,
@@ -604,12 +1127,18 @@ def apply_llm_groups(pb: PageBatch, grouping: Dict[str, Any]) -> PageBatch:
         Обновлённый PageBatch
     """
     by_id = {s.blockid: s for s in pb.segments}
+    changed = False
 
     for g in grouping.get("groups", []):
         bid = int(g.get("blockid", 0))
         new_type = str(g.get("type", "")).strip()
-        if bid in by_id and new_type:
+        if bid in by_id and new_type and by_id[bid].type != new_type:
             by_id[bid].type = new_type
+            changed = True
+
+    # Типы не изменились, порядок и нумерация уже верные - страница та же
+    if not changed and _in_reading_order(pb.segments):
+        return pb
 
     # Возвращаем исходный порядок/нумерацию
     segs = sort_segments_reading_order(list(by_id.values()))
@@ -640,6 +1169,9 @@ def run_pipeline_pymupdf(
     use_llm_grouping: bool = False,
     pause_ms: int = 0,
     pause_hook: Optional[Callable[[], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    lms_concurrency: int = DEFAULT_LMS_CONCURRENCY,
+    ignore_cache: bool = False,
 ) -> None:
     """
     Конвейер с PyMuPDF экстрактором (без HURIDOCS).
@@ -651,6 +1183,9 @@ def run_pipeline_pymupdf(
     4. Перевод через LM Studio
     5. Экспорт в DOCX и аннотированный PDF
 
+    Этапы 1-4 идут потоком: страница уходит в перевод сразу после
+    извлечения и сплита, не дожидаясь разбора всего документа.
+
     Args:
         input_pdf: Путь к входному PDF файлу
         out_pdf_annotated: Путь для сохранения аннотированного PDF
@@ -659,7 +1194,7 @@ def run_pipeline_pymupdf(
         tgt_lang: Целевой язык
         lms_base: URL LM Studio API
         LMSTUDIO_MODEL: Название модели
-        batch_size: Размер батча для обработки
+        batch_size: Число страниц в одном запросе к LM Studio
         split_spreads_enabled: Включить разделение разворотов
         force_split_spreads: Принудительное деление разворотов
         force_split_exceptions: Страницы-исключения для split
@@ -668,87 +1203,64 @@ def run_pipeline_pymupdf(
         use_llm_grouping: Использовать LLM для группировки сегментов
         pause_ms: Пауза между страницами
         pause_hook: Callback для паузы
+        cancel_event: Событие отмены перевода (см. wait_or_cancel)
+        lms_concurrency: Число страниц, одновременно переводимых в LM Studio
+        ignore_cache: Не использовать дисковый кэш переводов
     """
     init_metrics(out_docx)
 
-    logging.info("PyMuPDF: шаг 1/4 — извлечение и сборка абзацев...")
-    pages = extract_pages_pymupdf(input_pdf, start_page=start_page, end_page=end_page)
-    logging.info("Извлечено %d страниц (до сплита).", len(pages))
+    # Страницы идут в перевод потоком: пока переводятся первые пачки,
+    # извлекаются и делятся следующие
+    logging.info(
+        "PyMuPDF: шаги 1-3/4 — извлечение, сплит%s и перевод через LM Studio...",
+        ", LLM-группировка" if use_llm_grouping else "",
+    )
 
-    # Разделение разворотов
-    if split_spreads_enabled:
-        if force_split_spreads:
-            total_pages = max((pb.pagenumber for pb in pages), default=0)
-            ex = parse_page_set(force_split_exceptions, total_pages)
-            pages = split_spreads_force_half(pages, ex)
-            logging.info(
-                "После сплита (force-half, исключения=%s) логических страниц: %d.",
-                sorted(list(ex)) if ex else "∅",
-                len(pages),
+    # PDF открыт один раз для сплита и аннотации
+    doc = pymupdf.open(input_pdf)
+    try:
+        pages: List[PageBatch] = []
+        store = None if ignore_cache else TranslationStore()
+        try:
+            translations = _translate_pages_concurrent(
+                _iter_pymupdf_pages(
+                    iter_pages_pymupdf_advanced(input_pdf, start_page, end_page),
+                    doc,
+                    pages,
+                    split_spreads_enabled=split_spreads_enabled,
+                    force_split_spreads=force_split_spreads,
+                    force_split_exceptions=force_split_exceptions,
+                    use_llm_grouping=use_llm_grouping,
+                    lms_model=lms_model,
+                    lms_base=lms_base,
+                ),
+                lms_model=lms_model,
+                src_lang=src_lang,
+                tgt_lang=tgt_lang,
+                lms_base=lms_base,
+                concurrency=lms_concurrency,
+                batch_size=batch_size,
+                pause_ms=pause_ms,
+                pause_hook=pause_hook,
+                store=store,
+                cancel_event=cancel_event,
             )
-        else:
-            pages = split_spreads(pages, pdf_path=input_pdf, debug=True)
-            logging.info("После сплита (auto) логических страниц: %d.", len(pages))
-
-    # Дополнительная LLM-группировка ролей (опционально)
-    if use_llm_grouping:
-        logging.info("PyMuPDF: шаг 2/4 — LLM-группировка ролей и блоков...")
-        grouped: List[PageBatch] = []
-        for pb in pages:
-            try:
-                payload = featurize_segments_for_llm(pb)
-                grouping = llm_group_segments(
-                    model=lms_model, lms_base=lms_base, page_payload=payload
-                )
-                grouped.append(apply_llm_groups(pb, grouping))
-            except Exception as e:
-                logging.warning(
-                    f"LLM grouping failed on page {pb.pagenumber}: {e} — using passthrough"
-                )
-                grouped.append(pb)
-        pages = grouped
-
-    # Перевод
-    logging.info("PyMuPDF: шаг 3/4 — перевод через LM Studio...")
-    translations: Dict[Tuple[int, str, int], str] = {}
-
-    for pb in pages:
-        if pause_hook:
-            pause_hook()
-
-        segs = [s for s in pb.segments if s.text.strip()]
-        if not segs:
-            if pause_ms > 0:
-                time.sleep(pause_ms / 1000.0)
-            continue
-
-        page_map = lmstudio_translate_simple(
-            model=lms_model,
-            pagenumber=pb.pagenumber,
-            segments=segs,
-            src_lang=src_lang,
-            tgt_lang=tgt_lang,
-            base_url=lms_base,
+        finally:
+            if store is not None:
+                store.close()
+
+        # Вывод
+        logging.info("PyMuPDF: шаг 4/4 — выпуск аннотированного PDF и DOCX...")
+        annotate_pdf_with_segments(
+            doc,
+            out_pdf_annotated,
+            pages,
+            use_comments=True,  # Использовать комментарии
+            annotation_type="none",  # С подсветкой
+            include_translation=True,  # Включить перевод
         )
-
-        side = getattr(pb, "logical_side", "")
-        for s in segs:
-            translations[(pb.pagenumber, side, s.blockid)] = page_map.get(s.blockid, "")
-
-        if pause_ms > 0:
-            time.sleep(pause_ms / 1000.0)
-
-    # Вывод
-    logging.info("PyMuPDF: шаг 4/4 — выпуск аннотированного PDF и DOCX...")
-    assert_layout_invariants(pages)
-    annotate_pdf_with_segments(
-        input_pdf,
-        out_pdf_annotated,
-        pages,
-        use_comments=True,  # Использовать комментарии
-        annotation_type="none",  # С подсветкой
-        include_translation=True,  # Включить перевод
-    )
+    finally:
+        doc.close()
     export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
 
     logging.info("Готово: %s и %s", out_pdf_annotated, out_docx)
@@ -769,8 +1281,12 @@ def run_pipeline_layoutlmv3(
     force_split_exceptions: str = "",
     use_gpu: bool = True,
     dpi: int = 200,
+    batch_size: int = 15,
     pause_ms: int = 0,
     pause_hook: Optional[Callable[[], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    lms_concurrency: int = DEFAULT_LMS_CONCURRENCY,
+    ignore_cache: bool = False,
 ) -> None:
     """
     Конвейер обработки PDF через LayoutLMv3.
@@ -797,8 +1313,12 @@ def run_pipeline_layoutlmv3(
         force_split_exceptions: Страницы-исключения для split
         use_gpu: Использовать GPU для LayoutLMv3
         dpi: DPI для конвертации PDF → изображение
+        batch_size: Число страниц в одном запросе к LM Studio
         pause_ms: Пауза между страницами (мс)
         pause_hook: Callback функция для паузы
+        cancel_event: Событие отмены перевода (см. wait_or_cancel)
+        lms_concurrency: Число страниц, одновременно переводимых в LM Studio
+        ignore_cache: Не использовать дисковый кэш переводов
     """
     from fx_translator.api.layoutlmv3 import LayoutLMv3Analyzer
 
@@ -834,75 +1354,80 @@ def run_pipeline_layoutlmv3(
     # Шаг 2: Постобработка (мягкая волна)
     logging.info("Шаг 2/4: Постобработка сегментов...")
 
-    # Первая волна - мягкое уточнение
-    pages = [refine_huridocs_segments(pb, xtol=3.0, gaptol=4.0) for pb in pages]
+    # Первая волна - мягкое уточнение и deglue для разделения слипшихся
+    # блоков (рафинировка идёт в воркерах deglue)
+    pages = deglue_pages_pdfaware(
+        pages,
+        pdf_path=input_pdf,
+        refine=partial(refine_huridocs_segments, xtol=3.0, gaptol=4.0),
+    )
 
-    # Deglue для разделения слипшихся блоков
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
+    # Дальше PDF открыт один раз: сплит, вторая волна и аннотация работают
+    # с одним документом (первая волна выше раздаёт страницы пулу
+    # процессов, ей нужен путь)
+    doc = pymupdf.open(input_pdf)
+    try:
+        # Разделение разворотов
+        if split_spreads_enabled:
+            total_pages = max((pb.pagenumber for pb in pages), default=0)
 
-    # Разделение разворотов
-    if split_spreads_enabled:
-        total_pages = max((pb.pagenumber for pb in pages), default=0)
-
-        if force_split_spreads:
-            ex = parse_page_set(force_split_exceptions, total_pages)
-            pages = split_spreads_force_half(pages, ex)
-            logging.info(
-                f"После сплита (force-half, исключения={sorted(list(ex)) if ex else '∅'}) "
-                f"логических страниц: {len(pages)}"
-            )
-        else:
-            pages = split_spreads(pages, pdf_path=input_pdf, debug=True)
-            logging.info(f"После сплита (auto) логических страниц: {len(pages)}")
-
-    # Вторая волна постобработки после сплита
-    pages = [refine_huridocs_segments(pb, xtol=3.0, gaptol=4.0) for pb in pages]
-    pages = deglue_pages_pdfaware(pages, pdf_path=input_pdf)
-
-    # Шаг 3: Перевод
-    logging.info("Шаг 3/4: Перевод через LM Studio...")
-    translations: Dict[Tuple[int, str, int], str] = {}
-
-    for page_batch in pages:
-        if pause_hook:
-            pause_hook()
-
-        segs_nonempty = [s for s in page_batch.segments if s.text.strip()]
-        if not segs_nonempty:
-            if pause_ms > 0:
-                time.sleep(pause_ms / 1000.0)
-            continue
-
-        page_map = lmstudio_translate_simple(
-            model=lms_model,
-            pagenumber=page_batch.pagenumber,
-            segments=segs_nonempty,
-            src_lang=src_lang,
-            tgt_lang=tgt_lang,
-            base_url=lms_base,
+            if force_split_spreads:
+                ex = parse_page_set(force_split_exceptions, total_pages)
+                pages = split_spreads_force_half(pages, ex)
+                excl = sorted(list(ex)) if ex else "∅"
+                logging.info(
+                    f"После сплита (force-half, исключения={excl}) "
+                    f"логических страниц: {len(pages)}"
+                )
+            else:
+                pages = split_spreads(pages, pdf_path=doc, debug=True)
+                logging.info(f"После сплита (auto) логических страниц: {len(pages)}")
+
+        # Вторая волна постобработки после сплита (повторный deglue - только
+        # страницам, которые изменили сплит или рафинировка)
+        pages = deglue_pages_pdfaware(
+            pages,
+            pdf_path=doc,
+            refine=partial(refine_huridocs_segments, xtol=3.0, gaptol=4.0),
+            skip_unchanged=True,
         )
 
-        side = getattr(page_batch, "logical_side", "")
-        for s in segs_nonempty:
-            translations[(page_batch.pagenumber, side, s.blockid)] = page_map.get(
-                s.blockid, ""
+        # Разметка дальше не меняется - проверяем её до перевода
+        assert_layout_invariants(pages)
+
+        # Шаг 3: Перевод
+        logging.info("Шаг 3/4: Перевод через LM Studio...")
+        store = None if ignore_cache else TranslationStore()
+        try:
+            translations = _translate_pages_concurrent(
+                pages,
+                lms_model=lms_model,
+                src_lang=src_lang,
+                tgt_lang=tgt_lang,
+                lms_base=lms_base,
+                concurrency=lms_concurrency,
+                batch_size=batch_size,
+                pause_ms=pause_ms,
+                pause_hook=pause_hook,
+                store=store,
+                cancel_event=cancel_event,
             )
-
-        if pause_ms > 0:
-            time.sleep(pause_ms / 1000.0)
-
-    # Шаг 4: Экспорт
-    logging.info("Шаг 4/4: Генерация вывода (PDF + DOCX)...")
-    assert_layout_invariants(pages)
-
-    annotate_pdf_with_segments(
-        input_pdf,
-        out_pdf_annotated,
-        pages,
-        use_comments=True,
-        annotation_type="none",
-        include_translation=True,
-    )
+        finally:
+            if store is not None:
+                store.close()
+
+        # Шаг 4: Экспорт
+        logging.info("Шаг 4/4: Генерация вывода (PDF + DOCX)...")
+        annotate_pdf_with_segments(
+            doc,
+            out_pdf_annotated,
+            pages,
+            use_comments=True,
+            annotation_type="none",
+            include_translation=True,
+        )
+    finally:
+        doc.close()
 
     export_docx(pages, translations, out_docx, title=os.path.basename(input_pdf))
 
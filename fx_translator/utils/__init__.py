@@ -9,22 +9,36 @@ from fx_translator.utils.text import (
     looks_captionish,
     looks_headerish,
     parse_page_set,
+    upper_median,
 )
 from fx_translator.utils.geometry import (
     x_overlap,
+    reading_order_key,
     sort_segments_reading_order,
+    segments_bbox,
     merge_segments,
 )
 from fx_translator.utils.json_helpers import (
     extract_first_json_like,
     extract_first_json_object,
+    parse_first_json_like,
+    json_dumps,
+    json_loads,
 )
 from fx_translator.utils.metrics import (
     Timer,
     init_metrics,
     log_metric,
+    flush_metrics,
     METRICS_PATH,
 )
+from fx_translator.utils.cache import (
+    TranslationStore,
+    file_digest,
+    load_pages_cache,
+    pages_cache_path,
+    save_pages_cache,
+)
 
 __all__ = [
     # Text utilities
@@ -34,16 +48,29 @@ __all__ = [
     "looks_captionish",
     "looks_headerish",
     "parse_page_set",
+    "upper_median",
     # Geometry utilities
     "x_overlap",
+    "reading_order_key",
     "sort_segments_reading_order",
+    "segments_bbox",
     "merge_segments",
     # JSON utilities
     "extract_first_json_like",
     "extract_first_json_object",
+    "parse_first_json_like",
+    "json_dumps",
+    "json_loads",
     # Metrics utilities
     "Timer",
     "init_metrics",
     "log_metric",
+    "flush_metrics",
     "METRICS_PATH",
+    # Cache utilities
+    "TranslationStore",
+    "file_digest",
+    "load_pages_cache",
+    "pages_cache_path",
+    "save_pages_cache",
 ]
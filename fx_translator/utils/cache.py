@@ -0,0 +1,207 @@
+"""
+Дисковый кэш результатов HURIDOCS и переводов LM Studio.
+
+Повторный прогон того же PDF (частый случай при правке разметки)
+не должен заново ходить в HURIDOCS и LM Studio:
+- разметка страниц хранится gzip-JSON файлом, ключ - хэш содержимого PDF
+  и параметры анализа;
+- переводы хранятся в SQLite (WAL), ключ - модель, языки и текст.
+"""
+
+from __future__ import annotations
+import os
+import gzip
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fx_translator.core.config import CACHE_DIR
+from fx_translator.core.models import PageBatch, Segment
+from fx_translator.utils.json_helpers import json_dumps, json_loads
+
+
+def file_digest(path: str) -> str:
+    """
+    Хэш содержимого файла (blake2b), читается блоками по 1 МБ.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Шестнадцатеричная строка хэша
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pages_cache_path(pdf_path: str, *params: Any) -> str:
+    """
+    Путь файла кэша разметки для PDF и параметров анализа.
+
+    Args:
+        pdf_path: Путь к PDF файлу
+        *params: Параметры, влияющие на результат анализа
+
+    Returns:
+        Путь к файлу кэша (файла может ещё не быть)
+    """
+    key = hashlib.blake2b(
+        f"{file_digest(pdf_path)}|{params!r}".encode("utf-8"), digest_size=20
+    ).hexdigest()
+    return os.path.join(CACHE_DIR, "huridocs", f"{key}.json.gz")
+
+
+def load_pages_cache(path: str) -> Optional[List[PageBatch]]:
+    """
+    Загружает страницы из кэша.
+
+    Args:
+        path: Путь из pages_cache_path()
+
+    Returns:
+        Список PageBatch или None, если кэша нет или он повреждён
+    """
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with gzip.open(path, "rb") as f:
+            data = json_loads(f.read())
+
+        return [
+            PageBatch(
+                pagenumber=pno,
+                segments=[Segment(*row) for row in rows],
+                logical_side=side,
+            )
+            for pno, side, rows in data
+        ]
+    except Exception as e:
+        logging.warning(f"Кэш разметки {path} не прочитан: {e}")
+        return None
+
+
+def save_pages_cache(path: str, pages: List[PageBatch]) -> None:
+    """
+    Сохраняет страницы в кэш (атомарно: запись во временный файл и rename).
+
+    Args:
+        path: Путь из pages_cache_path()
+        pages: Список PageBatch
+    """
+    data = [
+        [
+            pb.pagenumber,
+            pb.logical_side,
+            [
+                [
+                    s.pagenumber,
+                    s.left,
+                    s.top,
+                    s.width,
+                    s.height,
+                    s.pagewidth,
+                    s.pageheight,
+                    s.text,
+                    s.type,
+                    s.blockid,
+                    s.lineheight,
+                ]
+                for s in pb.segments
+            ],
+        ]
+        for pb in pages
+    ]
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Одна запись готовых байтов вместо потока мелких записей json.dump;
+        # уровень 6 вместо 9: файл на ~5% больше, сжатие в 1,5 раза быстрее
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(json_dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Кэш разметки {path} не сохранён: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class TranslationStore:
+    """
+    Постоянный кэш переводов в SQLite.
+
+    Одно соединение на объект, доступ из потоков перевода - под замком.
+    Журнал WAL позволяет другому процессу читать базу во время записи.
+
+    Example:
+        store = TranslationStore()
+        store.put_many([(("model", "en", "ru", "Hello"), "Привет")])
+        store.get_many([("model", "en", "ru", "Hello")])
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Открывает (или создаёт) базу переводов.
+
+        Args:
+            path: Путь к файлу базы (по умолчанию CACHE_DIR/translations.sqlite)
+        """
+        self.path = path or os.path.join(CACHE_DIR, "translations.sqlite")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " model TEXT, src TEXT, tgt TEXT, text TEXT, translation TEXT,"
+            " PRIMARY KEY (model, src, tgt, text))"
+        )
+        self._conn.commit()
+
+    def get_many(
+        self, keys: Iterable[Tuple[str, str, str, str]]
+    ) -> Dict[Tuple[str, str, str, str], str]:
+        """
+        Ищет переводы по ключам (модель, исходный язык, целевой язык, текст).
+
+        Returns:
+            Словарь найденных переводов; отсутствующих ключей в нём нет
+        """
+        found: Dict[Tuple[str, str, str, str], str] = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT translation FROM translations"
+                    " WHERE model=? AND src=? AND tgt=? AND text=?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+        return found
+
+    def put_many(self, items: Iterable[Tuple[Tuple[str, str, str, str], str]]) -> None:
+        """Сохраняет переводы одной транзакцией."""
+        rows = [(*key, translation) for key, translation in items]
+        if not rows:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations"
+                    " (model, src, tgt, text, translation) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self._conn.close()
@@ -5,10 +5,22 @@
 """
 
 from __future__ import annotations
-from typing import List
+from operator import attrgetter
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from fx_translator.core.models import Segment
 
+# Начиная с этого числа сегментов lexsort по массивам координат быстрее
+# list.sort с Python-ключом (на меньших списках дороже создание массивов)
+_LEXSORT_MIN = 128
+
+_get_top = attrgetter("top")
+_get_left = attrgetter("left")
+# Ключ сортировки в порядке чтения: сверху вниз, слева направо
+reading_order_key = attrgetter("top", "left")
+
 
 def x_overlap(s1: Segment, s2: Segment) -> float:
     """
@@ -40,7 +52,36 @@ def sort_segments_reading_order(segments: List[Segment]) -> List[Segment]:
     Returns:
         Отсортированный список сегментов
     """
-    return sorted(segments, key=lambda s: (s.top, s.left))
+    n = len(segments)
+    if n < _LEXSORT_MIN:
+        return sorted(segments, key=reading_order_key)
+
+    # Координаты - в отдельные массивы, порядок - одним устойчивым lexsort
+    top = np.fromiter(map(_get_top, segments), dtype=np.float64, count=n)
+    left = np.fromiter(map(_get_left, segments), dtype=np.float64, count=n)
+    return [segments[i] for i in np.lexsort((left, top)).tolist()]
+
+
+def segments_bbox(
+    segments: List[Segment],
+) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Общий bounding box сегментов страницы.
+
+    Args:
+        segments: Список сегментов
+
+    Returns:
+        (left, top, right, bottom) или None для пустого списка
+    """
+    if not segments:
+        return None
+
+    left = min(s.left for s in segments)
+    top = min(s.top for s in segments)
+    right = max(s.left + s.width for s in segments)
+    bottom = max(s.top + s.height for s in segments)
+    return left, top, right, bottom
 
 
 def merge_segments(s1: Segment, s2: Segment) -> Segment:
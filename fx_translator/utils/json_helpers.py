@@ -1,34 +1,72 @@
 """
 Утилиты для работы с JSON.
 
-Этот модуль содержит функции для извлечения и парсинга JSON из текста.
+Этот модуль содержит функции для извлечения и парсинга JSON из текста,
+а также быстрые json_loads/json_dumps (orjson, если установлен).
 """
 
 from __future__ import annotations
-from typing import List, Optional
+import json
+import re
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 
-def extract_first_json_like(s: str) -> str:
-    """
-    Извлекает первый JSON объект или массив из строки.
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Компактный UTF-8 JSON через стандартный json."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Реализация выбирается один раз при импорте
+_loads: Callable[[Union[bytes, str]], Any]
+_dumps: Callable[[Any], bytes]
+try:
+    import orjson
 
-    Ищет первый символ { или [, затем отслеживает вложенность скобок,
-    игнорируя содержимое строк, и возвращает найденный JSON.
+    _loads, _dumps = orjson.loads, orjson.dumps
+except ImportError:
+    _loads, _dumps = json.loads, _stdlib_dumps
+
+# Кандидаты на начало JSON и сколько из них проверять C-парсером, прежде
+# чем перейти к посимвольному сканеру (на битом ответе каждая попытка
+# может дочитать строку до конца)
+_JSON_START_RE = re.compile(r"[\[{]")
+_MAX_DECODE_ATTEMPTS = 16
+_DECODER = json.JSONDecoder()
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    Разбирает JSON (orjson, если установлен, иначе json).
 
     Args:
-        s: Строка, содержащая JSON
+        data: JSON в байтах или строке (например, resp.content)
 
     Returns:
-        Извлечённая JSON строка
+        Разобранный объект
+    """
+    return _loads(data)
 
-    Raises:
-        ValueError: Если JSON объект или массив не найден
+
+def json_dumps(obj: Any) -> bytes:
     """
+    Сериализует объект в компактный UTF-8 JSON (orjson, если установлен).
+
+    Args:
+        obj: Объект для сериализации
+
+    Returns:
+        Байты JSON (например, для data= запроса с application/json)
+    """
+    return _dumps(obj)
+
+
+def _strip_json_wrapper(s: str) -> str:
+    """Снимает с ответа модели пробелы, ограду ``` и префикс "json"."""
     s = s.strip()
 
-    # Удаляем префиксы (например, "json\\n{...}")
-    if s.startswith("\\n"):
-        nl = s.find("\\n")
+    # Удаляем ограду с языком (например, "```json\n{...}")
+    if s.startswith("```"):
+        nl = s.find("\n")
         if nl != -1:
             s = s[nl + 1 :]
 
@@ -40,6 +78,36 @@ def extract_first_json_like(s: str) -> str:
     if s.lower().startswith("json"):
         s = s[4:].lstrip()
 
+    return s
+
+
+def _decode_first(s: str) -> Optional[Tuple[Any, int, int]]:
+    """
+    Разбирает первый корректный JSON с символа { или [ (JSONDecoder.raw_decode).
+
+    Returns:
+        (объект, начало, конец) или None, если среди первых
+        _MAX_DECODE_ATTEMPTS кандидатов корректного JSON нет
+    """
+    for n, m in enumerate(_JSON_START_RE.finditer(s)):
+        if n == _MAX_DECODE_ATTEMPTS:
+            break
+        try:
+            obj, end = _DECODER.raw_decode(s, m.start())
+        except ValueError:
+            continue
+        return obj, m.start(), end
+
+    return None
+
+
+def _scan_first_json(s: str) -> str:
+    """
+    Посимвольно ищет первый сбалансированный фрагмент {...} или [...].
+
+    Raises:
+        ValueError: Если JSON объект или массив не найден
+    """
     start: Optional[int] = None
     stack: List[str] = []
     in_str = False
@@ -51,7 +119,7 @@ def extract_first_json_like(s: str) -> str:
             if esc:
                 esc = False
                 continue
-            if ch == "\\\\":
+            if ch == "\\":
                 esc = True
                 continue
             if ch == str_q:
@@ -83,6 +151,67 @@ def extract_first_json_like(s: str) -> str:
     raise ValueError("JSON object or array not found in model response")
 
 
+def extract_first_json_like(s: str) -> str:
+    """
+    Извлекает первый JSON объект или массив из строки.
+
+    Сначала пробует разобрать JSON C-парсером (JSONDecoder.raw_decode) с
+    каждого символа { или [ и возвращает первый корректный фрагмент. Если
+    корректного нет, ищет первый символ { или [ и отслеживает вложенность
+    скобок, игнорируя содержимое строк.
+
+    Args:
+        s: Строка, содержащая JSON
+
+    Returns:
+        Извлечённая JSON строка
+
+    Raises:
+        ValueError: Если JSON объект или массив не найден
+    """
+    s = _strip_json_wrapper(s)
+
+    found = _decode_first(s)
+    if found is not None:
+        _, start, end = found
+        return s[start:end]
+
+    return _scan_first_json(s)
+
+
+def parse_first_json_like(s: str) -> Any:
+    """
+    Извлекает и сразу разбирает первый JSON объект или массив из строки.
+
+    То же, что json_loads(extract_first_json_like(s)), но без повторного
+    разбора: ответ целиком из JSON (обычный случай) разбирается одним
+    json_loads (orjson, если установлен), иначе берётся объект, уже
+    разобранный при поиске фрагмента.
+
+    Args:
+        s: Строка, содержащая JSON
+
+    Returns:
+        Разобранный объект
+
+    Raises:
+        ValueError: Если JSON не найден или найденный фрагмент некорректен
+    """
+    s = _strip_json_wrapper(s)
+
+    if s[:1] in ("[", "{"):
+        try:
+            return json_loads(s)
+        except ValueError:
+            pass
+
+    found = _decode_first(s)
+    if found is not None:
+        return found[0]
+
+    return json_loads(_scan_first_json(s))
+
+
 def extract_first_json_object(s: str) -> str:
     """
     Псевдоним для extract_first_json_like.
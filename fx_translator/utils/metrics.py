@@ -2,16 +2,32 @@
 Утилиты для сбора метрик и профилирования.
 
 Этот модуль содержит инструменты для измерения времени выполнения и логирования метрик.
+
+Строки метрик пишет в CSV фоновый поток: log_metric только кладёт строку
+в очередь, файл открыт один раз и пишется пачками.
 """
 
 from __future__ import annotations
+import atexit
+import logging
+import queue
 import time
 import csv
-from typing import Optional
+import threading
+from typing import IO, Any, List, Optional, Tuple
 
 # Глобальный путь к файлу метрик
 METRICS_PATH: Optional[str] = None
 
+# Сколько строк писатель забирает из очереди за раз
+_WRITE_BATCH = 256
+
+# Элементы очереди: (путь, строка) или (None, событие) - сигнал дописать
+# накопленное, закрыть файл и отметить событие
+_queue: "queue.SimpleQueue[Tuple[Optional[str], Any]]" = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
 
 class Timer:
     """
@@ -25,7 +41,7 @@ class Timer:
 
     def __init__(self) -> None:
         """Инициализирует таймер с текущим временем."""
-        self.t0 = time.perf_counter()
+        self.t0 = time.perf_counter_ns()
 
     def ms(self) -> int:
         """
@@ -34,7 +50,99 @@ class Timer:
         Returns:
             Количество миллисекунд с момента создания таймера
         """
-        return int((time.perf_counter() - self.t0) * 1000)
+        return (time.perf_counter_ns() - self.t0) // 1_000_000
+
+    def us(self) -> int:
+        """
+        Возвращает прошедшее время в микросекундах.
+
+        Returns:
+            Количество микросекунд с момента создания таймера
+        """
+        return (time.perf_counter_ns() - self.t0) // 1000
+
+
+def _writer_loop() -> None:
+    """Фоновый писатель: забирает строки пачками и дописывает их в CSV."""
+    f: Optional[IO[str]] = None
+    f_path: Optional[str] = None
+
+    def _close() -> None:
+        nonlocal f, f_path
+        if f is not None:
+            f.close()
+        f, f_path = None, None
+
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < _WRITE_BATCH:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        rows: List[List[Any]] = []
+        for path, item in batch:
+            try:
+                if path is not None and path == f_path:
+                    rows.append(item)
+                    continue
+
+                if rows and f is not None:
+                    csv.writer(f).writerows(rows)
+                rows = []
+                if path is None:
+                    _close()
+                    item.set()
+                    continue
+
+                _close()
+                f = open(path, "a", newline="", encoding="utf-8", buffering=1 << 16)
+                f_path = path
+                rows.append(item)
+            except OSError as e:
+                logging.warning(f"Метрики не записаны: {e}")
+                _close()
+                rows = []
+
+        try:
+            if f is not None:
+                if rows:
+                    csv.writer(f).writerows(rows)
+                f.flush()
+        except OSError as e:
+            logging.warning(f"Метрики не записаны: {e}")
+            _close()
+
+
+def _ensure_writer() -> None:
+    """Запускает фоновый писатель метрик, если он ещё не запущен."""
+    global _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(
+                target=_writer_loop, name="metrics-writer", daemon=True
+            )
+            _writer.start()
+
+
+def flush_metrics(timeout: Optional[float] = 5.0) -> None:
+    """
+    Дожидается записи всех метрик, поставленных в очередь, и закрывает файл.
+
+    Args:
+        timeout: Сколько ждать писателя в секундах (None - без ограничения)
+    """
+    if _writer is None:
+        return
+
+    done = threading.Event()
+    _queue.put((None, done))
+    done.wait(timeout)
+
+
+atexit.register(flush_metrics)
 
 
 def init_metrics(out_docx: str) -> None:
@@ -50,6 +158,9 @@ def init_metrics(out_docx: str) -> None:
 
     import os
 
+    # Строки прошлого прогона дописываются до того, как файл пересоздан
+    flush_metrics()
+
     base, _ = os.path.splitext(out_docx)
     METRICS_PATH = f"{base}.metrics.csv"
 
@@ -70,7 +181,9 @@ def log_metric(
     info: str = "",
 ) -> None:
     """
-    Записывает метрику в CSV файл.
+    Ставит метрику в очередь на запись в CSV файл.
+
+    Время строки фиксируется при вызове; сам файл пишет фоновый поток.
 
     Args:
         stage: Название этапа (например, "huridocs", "translation")
@@ -84,9 +197,10 @@ def log_metric(
     if not METRICS_PATH:
         return
 
-    with open(METRICS_PATH, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(
+    _ensure_writer()
+    _queue.put(
+        (
+            METRICS_PATH,
             [
                 time.strftime("%Y-%m-%d %H:%M:%S"),
                 stage,
@@ -96,5 +210,6 @@ def log_metric(
                 count if count is not None else "",
                 size_bytes if size_bytes is not None else "",
                 info,
-            ]
+            ],
         )
+    )
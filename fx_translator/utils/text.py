@@ -6,10 +6,29 @@
 
 from __future__ import annotations
 import re
-from typing import Optional, List
+from typing import Optional, List, Sequence
+
+import numpy as np
 
 from fx_translator.core.models import Segment
 
+# Начиная с этого размера np.partition (O(n)) быстрее полной сортировки
+_PARTITION_MIN = 16
+
+# Мягкий перенос (U+00AD) удаляется, неразрывный пробел (U+00A0) - пробел
+_CLEAN_TABLE = str.maketrans({"\u00ad": None, "\u00a0": " "})
+
+# Типичные префиксы ответа модели: каждый снимается не больше одного раза,
+# в этом порядке, вместе с пробелами после него
+_BAD_PREFIX_RE = re.compile(
+    r"(?:\*\*\s*)?(?:Response:\s*)?(?:Here is\s*)?(?:Here are\s*)?"
+    r"(?:```\s*)?(?:JSON:\s*)?",
+    re.IGNORECASE,
+)
+
+# Типичные префиксы подписей ("fig" покрывает и "figure")
+_CAPTION_PREFIX_RE = re.compile(r"(?:fig|table|схема|рисунок|таблица)", re.IGNORECASE)
+
 
 def sanitize_model_content(s: str) -> str:
     """
@@ -24,18 +43,7 @@ def sanitize_model_content(s: str) -> str:
     s = s.strip()
 
     # Удаляем типичные префиксы
-    bad_prefixes = [
-        "**",
-        "Response:",
-        "Here is",
-        "Here are",
-        "```",
-        "JSON:",
-    ]
-
-    for bp in bad_prefixes:
-        if s.lower().startswith(bp.lower()):
-            s = s[len(bp) :].lstrip()
+    s = _BAD_PREFIX_RE.sub("", s, count=1)
 
     # Удаляем начальный перевод строки
     if s.startswith("\\n"):
@@ -63,11 +71,30 @@ def clean_text_inplace(text: str) -> str:
     if not text:
         return text
 
-    # Удаляем мягкий перенос (U+00AD) и неразрывный пробел (U+00A0)
-    text = text.replace("\\u00ad", "").replace("\\u00a0", " ")
+    # Удаляем мягкий перенос (U+00AD) и неразрывный пробел (U+00A0) одним
+    # проходом и нормализуем пробелы (заменяем множественные на один)
+    return " ".join(text.translate(_CLEAN_TABLE).split())
 
-    # Нормализуем пробелы (заменяем множественные на один)
-    return " ".join(text.split())
+
+def upper_median(values: Sequence[int]) -> int:
+    """
+    Возвращает верхнюю медиану (элемент с индексом n // 2 после сортировки).
+
+    Для длинных списков использует частичный отбор вместо полной сортировки.
+
+    Args:
+        values: Непустая последовательность чисел
+
+    Returns:
+        Верхняя медиана
+    """
+    n = len(values)
+    mid = n // 2
+
+    if n < _PARTITION_MIN:
+        return sorted(values)[mid]
+
+    return int(np.partition(np.asarray(values, dtype=np.int32), mid)[mid])
 
 
 def denoise_soft_linebreaks(
@@ -96,19 +123,21 @@ def denoise_soft_linebreaks(
         return seg
 
     # Вычисляем медианную длину строк
-    lens = [len(ln.strip()) for ln in lines if ln.strip()]
-    if lens:
-        med = sorted(lens)[len(lens) // 2]
-    else:
-        med = 60
+    lens = [n for n in (len(ln.strip()) for ln in lines) if n]
+    med = upper_median(lens) if lens else 60
 
     base = max(30, int(0.9 * med))
     thresh = (
         prevlenthresh if isinstance(prevlenthresh, int) and prevlenthresh > 0 else base
     )
 
+    # Строки в out уже без хвостовых пробелов; признак "строка - число"
+    # для последней строки out переносится с прошлой итерации
     out: List[str] = []
+    prev_digit = False
     for i, ln in enumerate(lines):
+        ln_digit = ln.strip().isdigit()
+
         if i > 0 and ln and out and out[-1]:
             prev = out[-1]
 
@@ -117,16 +146,18 @@ def denoise_soft_linebreaks(
                 len(prev) < thresh
                 and not punctbreakre.search(prev)
                 and not listmarkerre.match(ln)
-                and not prev.strip().isdigit()
-                and not ln.strip().isdigit()
+                and not prev_digit
+                and not ln_digit
                 and len(ln) > 3
             )
 
             if shouldmerge:
-                out[-1] = prev.rstrip() + " " + ln.lstrip()
+                out[-1] = prev + " " + ln.lstrip()
+                prev_digit = False
                 continue
 
         out.append(ln)
+        prev_digit = ln_digit
 
     seg.text = "\\n".join(out)
     return seg
@@ -142,17 +173,14 @@ def looks_captionish(text: str) -> bool:
     Returns:
         True если текст похож на подпись
     """
-    text = text.strip().lower()
+    text = text.strip()
 
     # Типичные префиксы подписей
-    caption_prefixes = ["fig", "figure", "table", "схема", "рисунок", "таблица"]
-
-    for prefix in caption_prefixes:
-        if text.startswith(prefix):
-            return True
+    if _CAPTION_PREFIX_RE.match(text):
+        return True
 
     # Короткие тексты в конце страницы часто являются подписями
-    if len(text) < 100 and any(kw in text for kw in [":", "—"]):
+    if len(text) < 100 and (":" in text or "—" in text):
         return True
 
     return False
@@ -170,17 +198,18 @@ def looks_headerish(text: str, fontsize: float = 0.0) -> bool:
         True если текст похож на заголовок
     """
     text = text.strip()
+    n = len(text)
 
     # Короткий текст с большим шрифтом
-    if fontsize > 14.0 and len(text) < 150:
+    if fontsize > 14.0 and n < 150:
         return True
 
-    # Заглавные буквы
-    if text.isupper() and len(text) < 100:
+    # Заглавные буквы (длина проверяется раньше прохода по символам)
+    if n < 100 and text.isupper():
         return True
 
     # Текст без точки в конце (но не слишком длинный)
-    if not text.endswith(".") and len(text) < 80 and len(text.split()) <= 10:
+    if n < 80 and not text.endswith(".") and len(text.split()) <= 10:
         return True
 
     return False
@@ -212,8 +241,7 @@ def parse_page_set(spec: str, total_pages: int) -> set[int]:
                 lo, hi = int(a), int(b)
                 if lo > hi:
                     lo, hi = hi, lo
-                for p in range(max(1, lo), min(total_pages, hi) + 1):
-                    out.add(p)
+                out.update(range(max(1, lo), min(total_pages, hi) + 1))
         elif part.isdigit():
             p = int(part)
             if 1 <= p <= total_pages: